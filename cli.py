@@ -22,8 +22,9 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.syntax import Syntax
 
-from engine.core import TestEngine
-from engine.models import HealingMode, StepStatus
+# Enums only: engine.core (Playwright, pydantic) is imported by the
+# commands that run a browser, so --help and inspect start quickly.
+from engine._enums import HealingMode, StepStatus
 
 console = Console()
 
@@ -75,6 +76,8 @@ def record(url: str, output: str, name: str, verbose: bool):
         )
     )
 
+    from engine.core import TestEngine
+
     engine = TestEngine(
         llm_enabled=False,
         healing_mode="disabled",
@@ -149,6 +152,8 @@ def execute(
         )
     )
 
+    from engine.core import TestEngine
+
     engine = TestEngine(
         llm_enabled=llm,
         healing_mode=healing,
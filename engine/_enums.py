@@ -0,0 +1,44 @@
+"""
+Enums shared across the engine.
+
+Kept free of heavy imports (no pydantic / playwright) so tools that only
+need the enum values can import them cheaply.  Re-exported by engine.models.
+"""
+
+from enum import Enum
+
+
+class ActionType(str, Enum):
+    CLICK = "click"
+    DBLCLICK = "dblclick"
+    TYPE = "type"
+    SELECT = "select"
+    CHECK = "check"
+    UNCHECK = "uncheck"
+    HOVER = "hover"
+    KEYPRESS = "keypress"
+    SCROLL = "scroll"
+    NAVIGATE = "navigate"
+
+
+class HealingMode(str, Enum):
+    DISABLED = "disabled"
+    STRICT = "strict"
+    AUTO_UPDATE = "auto_update"
+    DEBUG = "debug"
+
+
+class StepStatus(str, Enum):
+    PASSED = "passed"
+    FAILED = "failed"
+    HEALED = "healed"
+
+
+class AssertionType(str, Enum):
+    VISIBLE = "visible"
+    HIDDEN = "hidden"
+    TEXT_EQUALS = "text_equals"
+    TEXT_CONTAINS = "text_contains"
+    MATCHES_PATTERN = "matches_pattern"
+    ATTRIBUTE_EQUALS = "attribute_equals"
+    EXISTS = "exists"
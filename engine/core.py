@@ -25,6 +25,7 @@ from engine.models import (
     StepStatus,
     TestModel,
     TestResult,
+    now_iso,
 )
 from engine.recorder import RecorderEngine
 from engine.selector import SelectorEngine
@@ -131,7 +132,7 @@ class TestEngine:
             logger.info("Recording interrupted by user")
         finally:
             final_model = recorder.stop()
-            final_model.updated_at = datetime.now(timezone.utc).isoformat()
+            final_model.updated_at = now_iso()
             await browser.close()
 
         # Save to disk
@@ -256,7 +257,8 @@ class TestEngine:
     async def _inject_recorder_script(self, page) -> None:
         """
         Inject a lightweight JS snippet that captures user actions
-        (click, input, select) and sends them to the backend via console.
+        (click, input, select) and sends them to the backend via the
+        recorder's exposed function (console.log when it is unavailable).
         """
         recorder_js = """
         (function() {
@@ -492,6 +494,15 @@ class TestEngine:
                 };
             }
 
+            // ── Delivery: exposed function, console as fallback ──────
+            function emit(payload) {
+                if (typeof window.__AUTOMATE_REC__ === 'function') {
+                    window.__AUTOMATE_REC__(payload);
+                } else {
+                    console.log('__RECORDER__:' + JSON.stringify(payload));
+                }
+            }
+
             // ── Click capture — promote to interactive parent ────────
             document.addEventListener('click', (e) => {
                 if (e.target.closest('#__assertion_menu') ||
@@ -502,14 +513,14 @@ class TestEngine:
                     e.target.id === '__assertion_menu' ||
                     window.__assertionLayerInjected && window.__assertionMode) return;
                 var target = getInteractiveParent(e.target);
-                console.log('__RECORDER__:' + JSON.stringify({
+                emit({
                     action: 'click',
                     fingerprint: fp(target),
                     intent: computeIntent(target),
                     url: window.location.href,
                     click_x: Math.round(e.clientX),
                     click_y: Math.round(e.clientY)
-                }));
+                });
             }, true);
 
             // Track last type step per element to avoid duplicate from change after paste/input
@@ -524,12 +535,12 @@ class TestEngine:
                     if (_lastTypeKey === key) return;
                     _lastTypeKey = key;
                 }
-                console.log('__RECORDER__:' + JSON.stringify({
+                emit({
                     action: action,
                     value: value,
                     fingerprint: fp(el),
                     url: window.location.href
-                }));
+                });
             }
 
             // Paste: record immediately after paste (change fires only on blur, so paste was missed)
@@ -563,21 +574,21 @@ class TestEngine:
             document.addEventListener('change', (e) => {
                 const el = e.target;
                 if (el.tagName === 'SELECT') {
-                    console.log('__RECORDER__:' + JSON.stringify({
+                    emit({
                         action: 'select',
                         value: el.value || '',
                         fingerprint: fp(el),
                         url: window.location.href
-                    }));
+                    });
                     return;
                 }
                 if (el.type === 'checkbox' || el.type === 'radio') {
-                    console.log('__RECORDER__:' + JSON.stringify({
+                    emit({
                         action: el.checked ? 'check' : 'uncheck',
                         value: el.value || '',
                         fingerprint: fp(el),
                         url: window.location.href
-                    }));
+                    });
                 }
             }, true);
 
@@ -585,12 +596,12 @@ class TestEngine:
             document.addEventListener('keydown', (e) => {
                 if (window.__assertionMode) return;
                 if (['Enter', 'Tab', 'Escape'].includes(e.key)) {
-                    console.log('__RECORDER__:' + JSON.stringify({
+                    emit({
                         action: 'keypress',
                         value: e.key,
                         fingerprint: fp(e.target),
                         url: window.location.href
-                    }));
+                    });
                 }
             }, true);
 
@@ -603,7 +614,7 @@ class TestEngine:
                 _scrollTarget = e.target === document ? document.documentElement : e.target;
                 _scrollTimer = setTimeout(function() {
                     var el = _scrollTarget || document.documentElement;
-                    console.log('__RECORDER__:' + JSON.stringify({
+                    emit({
                         action: 'scroll',
                         fingerprint: fp(el === document.documentElement ? document.body : el),
                         value: JSON.stringify({
@@ -611,7 +622,7 @@ class TestEngine:
                             scrollY: Math.round(window.scrollY)
                         }),
                         url: window.location.href
-                    }));
+                    });
                     _scrollTarget = null;
                 }, 300);
             }, true);
@@ -15,26 +15,131 @@ Healing modes are controlled by EngineConfig.healing_mode:
 
 from __future__ import annotations
 
-import hashlib
+import asyncio
 import json
 import logging
+import re
 import time
+from collections import OrderedDict
 from dataclasses import asdict, dataclass
 from difflib import SequenceMatcher
+from functools import lru_cache
 from typing import Any, Optional
 
 from playwright.async_api import Page
+from pydantic import BaseModel
 
 from engine.models import (
     ElementFingerprint,
     EngineConfig,
     HealingMode,
+    SimilarityProfile,
 )
 
 logger = logging.getLogger(__name__)
 
+# (candidate key, template) rules for _build_selector_from_candidate, tried
+# in order; the first non-empty value wins.  Test ids come before the
+# role/name path, the remaining attributes after it.
+_TEST_ID_SELECTOR_RULES = (
+    ("dataTestid", '[data-testid="{}"]'),
+    ("dataCy", '[data-cy="{}"]'),
+)
+_ATTR_SELECTOR_RULES = (
+    ("ariaLabel", '[aria-label="{}"]'),
+    ("name", '[name="{}"]'),
+    ("placeholder", '[placeholder="{}"]'),
+)
+_FORM_TAGS = ("input", "select", "textarea", "button")
+
+# A trailing ".class" or "[attr...]" qualifier, stripped to find a cached
+# parent selector (div.foo.bar -> div.foo -> div).
+_TRAILING_QUALIFIER_RE = re.compile(r"(?:\.[\w-]+|\[[^\[\]]*\])\Z")
+
+
+def _text_ratio(original: SimilarityProfile, live: SimilarityProfile) -> float:
+    """SequenceMatcher ratio of the two profile texts, short-circuiting the
+    two cases that need no matching: equal texts and texts with no character
+    in common (checked on the profiles' precomputed character sets).
+    (Equal texts of 200+ chars still go through SequenceMatcher, as its
+    autojunk heuristic can lower their ratio below 1.0.)"""
+    a = original.text
+    b = live.text
+    if a == b and len(a) < 200:
+        return 1.0
+    if original.text_chars.isdisjoint(live.text_chars):
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+@lru_cache(maxsize=4096)
+def _profile_similarity(original: SimilarityProfile, live: SimilarityProfile) -> float:
+    """Similarity score of two fingerprint profiles; see
+    HealingEngine._compute_fingerprint_similarity for the weights."""
+    score = 0.0
+
+    # Tag match
+    if original.tag and live.tag:
+        score += 0.15 if original.tag == live.tag else 0
+
+    # Role match
+    if original.role and live.role:
+        score += 0.15 if original.role == live.role else 0
+    elif not original.role and not live.role:
+        score += 0.05
+
+    # data-testid / data-cy
+    if original.test_id and live.test_id:
+        score += 0.20 if original.test_id == live.test_id else 0
+    elif not original.test_id and not live.test_id:
+        score += 0.05
+
+    # Name match
+    if original.name and live.name:
+        score += 0.10 if original.name == live.name else 0
+
+    # Text similarity (SequenceMatcher ratio)
+    if original.text or live.text:
+        score += 0.25 * _text_ratio(original, live)
+    else:
+        score += 0.10
+
+    # Class overlap (Jaccard, exclude dynamic-looking classes)
+    oclasses = original.classes
+    lclasses = live.classes
+    if oclasses or lclasses:
+        inter = len(oclasses & lclasses)
+        union = len(oclasses | lclasses)
+        score += 0.05 * (inter / union if union else 0)
+    else:
+        score += 0.02
+
+    # Attribute overlap (href, placeholder, aria-label)
+    oset = original.attrs
+    lset = live.attrs
+    if oset or lset:
+        inter = len(oset & lset)
+        union = len(oset | lset)
+        score += 0.10 * (inter / union if union else 0)
+    else:
+        score += 0.03
+
+    return round(min(score, 1.0), 4)
+
+
+class _LLMHealingResponse(BaseModel):
+    """The JSON object the healing prompt asks the LLM to return.  Parsed
+    with model_validate_json (pydantic-core's native parser); unknown keys
+    are ignored."""
+
+    selector: Optional[str] = ""
+    confidence: float = 0.0
+    reasoning: Optional[str] = None
+    explanation: Optional[str] = ""
+    strategy: Optional[str] = ""
 
-@dataclass
+
+@dataclass(slots=True)
 class HealingResult:
     """Outcome of a healing attempt."""
 
@@ -49,9 +154,9 @@ class HealingResult:
     healed_fingerprint_similarity: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HealingTelemetry:
-    """Step 10: Per-heal metrics for observability."""
+    """Step 10: Per-heal metrics for observability (write-once record)."""
 
     original_selector: str
     healed_selector: str
@@ -71,7 +176,8 @@ class HealingEngine:
     def __init__(self, config: EngineConfig) -> None:
         self._config = config
         self._client = None  # lazily initialised
-        self._cache: dict[str, str] = {}
+        # failed selector -> healed selector, in least-recently-used order
+        self._cache: OrderedDict[str, str] = OrderedDict()
 
     # ------------------------------------------------------------------
     # Public API
@@ -101,15 +207,26 @@ class HealingEngine:
         start = time.monotonic()
         fp_hash = self._fingerprint_hash(fingerprint)
 
-        # Step 1: Check healing cache
-        cached = self._cache.get(failed_selector)
-        if cached and await self._validate_healed_selector(page, cached):
+        # Step 1: Check healing cache (exact, then healed parent selectors)
+        cached = self._cache_get(failed_selector)
+        exact = cached is not None
+        if not exact:
+            cached = self._cache_lookup_with_fallback(failed_selector)
+        if (
+            cached
+            and await self._validate_healed_selector(page, cached)
+            and (exact or await self._live_fingerprint_matches(page, cached, fingerprint))
+        ):
             logger.info("Healing cache hit for %s -> %s", failed_selector[:50], cached[:50])
             result = HealingResult(
                 success=True,
                 new_selector=cached,
                 confidence=self._config.confidence_threshold,
-                explanation="Restored from healing cache",
+                explanation=(
+                    "Restored from healing cache"
+                    if exact
+                    else "Restored from healing cache (parent selector)"
+                ),
                 attempts=0,
                 healing_method="cache",
             )
@@ -120,7 +237,7 @@ class HealingEngine:
         det_result = await self._deterministic_heal(page, fingerprint, failed_selector)
         if det_result.success:
             if mode != HealingMode.DEBUG:
-                self._cache[failed_selector] = det_result.new_selector
+                self._cache_put(failed_selector, det_result.new_selector)
             self._log_healing_telemetry(
                 failed_selector, det_result, fp_hash, start
             )
@@ -160,9 +277,7 @@ class HealingEngine:
                 live_fp = await self._extract_live_fingerprint(
                     page, result.new_selector
                 )
-                fingerprint_threshold = 0.5
-                if (fingerprint.tag_name or "").lower() in ("path", "svg"):
-                    fingerprint_threshold = 0.25
+                fingerprint_threshold = self._similarity_floor(fingerprint)
                 if live_fp:
                     similarity = self._compute_fingerprint_similarity(
                         fingerprint, live_fp
@@ -185,7 +300,7 @@ class HealingEngine:
                         result.explanation += " (debug mode – not applied)"
                     else:
                         logger.info("Healed selector: %s", result.new_selector)
-                        self._cache[failed_selector] = result.new_selector
+                        self._cache_put(failed_selector, result.new_selector)
                     result.healing_method = "llm"
                     result.llm_tokens_used = total_llm_tokens
                     self._log_healing_telemetry(
@@ -208,10 +323,59 @@ class HealingEngine:
         )
         return fail_result
 
+    def _cache_get(self, selector: str) -> Optional[str]:
+        """Cached healed selector for ``selector``, marking it recently used."""
+        healed = self._cache.get(selector)
+        if healed is not None:
+            self._cache.move_to_end(selector)
+        return healed
+
+    def _cache_put(self, selector: str, healed: str) -> None:
+        """Cache a healed selector, evicting the least recently used entries
+        beyond ``healing_cache_max``."""
+        self._cache[selector] = healed
+        self._cache.move_to_end(selector)
+        while len(self._cache) > self._config.healing_cache_max:
+            self._cache.popitem(last=False)
+
+    def _cache_lookup_with_fallback(self, selector: str) -> Optional[str]:
+        """Healed selector cached for ``selector`` or, failing that, for the
+        nearest parent obtained by stripping trailing ``.class`` / ``[attr]``
+        qualifiers.  Parent hits may point at a different element, so
+        callers must check them against the fingerprint.
+        """
+        while selector:
+            cached = self._cache_get(selector)
+            if cached is not None:
+                return cached
+            m = _TRAILING_QUALIFIER_RE.search(selector)
+            if not m:
+                return None
+            selector = selector[: m.start()]
+            if selector[-1:] in (" ", ">", "+", "~"):
+                return None  # would leave a dangling combinator
+        return None
+
+    @staticmethod
+    def _similarity_floor(fingerprint: ElementFingerprint) -> float:
+        """Minimum live-fingerprint similarity to accept a healed selector
+        (lower for SVG parts, which carry little identifying data)."""
+        if (fingerprint.tag_name or "").lower() in ("path", "svg"):
+            return 0.25
+        return 0.5
+
+    async def _live_fingerprint_matches(
+        self, page: Page, selector: str, fingerprint: ElementFingerprint
+    ) -> bool:
+        """True if the element ``selector`` resolves to resembles ``fingerprint``."""
+        live_fp = await self._extract_live_fingerprint(page, selector)
+        return live_fp is not None and self._compute_fingerprint_similarity(
+            fingerprint, live_fp
+        ) >= self._similarity_floor(fingerprint)
+
     def _fingerprint_hash(self, fp: ElementFingerprint) -> str:
         """Stable hash of fingerprint for telemetry (no PII)."""
-        key = f"{fp.tag_name}|{fp.role}|{fp.data_testid}|{fp.name}|{fp.aria_label}|{len(fp.text_content or '')}"
-        return hashlib.sha256(key.encode()).hexdigest()[:16]
+        return fp.stable_hash
 
     def _log_healing_telemetry(
         self,
@@ -357,16 +521,15 @@ class HealingEngine:
                 lines = cleaned.split("\n")
                 cleaned = "\n".join(lines[1:-1])
 
-            data = json.loads(cleaned)
-            explanation = data.get("reasoning") or data.get("explanation", "")
+            data = _LLMHealingResponse.model_validate_json(cleaned)
             return HealingResult(
                 success=True,
-                new_selector=data.get("selector", ""),
-                confidence=float(data.get("confidence", 0.0)),
-                explanation=explanation,
-                strategy=data.get("strategy", ""),
+                new_selector=data.selector or "",
+                confidence=data.confidence,
+                explanation=data.reasoning or data.explanation or "",
+                strategy=data.strategy or "",
             )
-        except (json.JSONDecodeError, ValueError) as e:
+        except ValueError as e:  # includes pydantic's ValidationError
             logger.warning("Could not parse LLM response: %s", raw[:200])
             return HealingResult(
                 success=False,
@@ -487,11 +650,17 @@ class HealingEngine:
             if count > 1:
                 logger.warning("Healed selector matches %d elements, using first", count)
             el = locator.first
-            if not await el.is_visible(timeout=2000):
+            # Independent driver round-trips: issue them together.
+            visible, enabled, box = await asyncio.gather(
+                el.is_visible(timeout=2000),
+                el.is_enabled(timeout=2000),
+                el.bounding_box(timeout=2000),
+            )
+            if not visible:
                 return False, "element not visible"
-            if not await el.is_enabled(timeout=2000):
+            if not enabled:
                 return False, "element not enabled"
-            if await el.bounding_box() is None:
+            if box is None:
                 return False, "element has no bounding box"
             return True, ""
         except Exception as e:
@@ -511,69 +680,26 @@ class HealingEngine:
         Weights: tag 0.15, role 0.15, data-testid/cy 0.20, name 0.10,
         text 0.25, class overlap 0.05, attribute overlap 0.10.
         """
-        score = 0.0
-
-        # Tag match
-        if original.tag_name and live.tag_name:
-            score += 0.15 if original.tag_name.lower() == live.tag_name.lower() else 0
-
-        # Role match
-        if original.role and live.role:
-            score += 0.15 if original.role.lower() == live.role.lower() else 0
-        elif not original.role and not live.role:
-            score += 0.05
-
-        # data-testid / data-cy
-        orig_test = original.data_testid or (original.attributes or {}).get("data-cy", "")
-        live_test = live.data_testid or (live.attributes or {}).get("data-cy", "")
-        if orig_test and live_test:
-            score += 0.20 if orig_test == live_test else 0
-        elif not orig_test and not live_test:
-            score += 0.05
-
-        # Name match
-        if original.name and live.name:
-            score += 0.10 if original.name == live.name else 0
-
-        # Text similarity (SequenceMatcher ratio)
-        otext = (original.text_content or "").strip()[:200]
-        ltext = (live.text_content or "").strip()[:200]
-        if otext or ltext:
-            score += 0.25 * SequenceMatcher(None, otext.lower(), ltext.lower()).ratio()
-        else:
-            score += 0.10
-
-        # Class overlap (Jaccard, exclude dynamic-looking classes)
-        oclasses = set(c for c in (original.class_names or []) if len(c) < 40)
-        lclasses = set(c for c in (live.class_names or []) if len(c) < 40)
-        if oclasses or lclasses:
-            inter = len(oclasses & lclasses)
-            union = len(oclasses | lclasses)
-            score += 0.05 * (inter / union if union else 0)
-        else:
-            score += 0.02
-
-        # Attribute overlap (href, placeholder, aria-label)
-        oattrs = {}
-        lattrs = {}
-        for fp, d in [(original, oattrs), (live, lattrs)]:
-            if fp.href:
-                d["href"] = fp.href
-            if fp.placeholder:
-                d["placeholder"] = fp.placeholder
-            if fp.aria_label:
-                d["aria-label"] = fp.aria_label
-            d.update(fp.attributes or {})
-        oset = set(oattrs.items())
-        lset = set(lattrs.items())
-        if oset or lset:
-            inter = len(oset & lset)
-            union = len(oset | lset)
-            score += 0.10 * (inter / union if union else 0)
-        else:
-            score += 0.03
-
-        return round(min(score, 1.0), 4)
+        return HealingEngine._compute_fingerprint_similarity_batch(original, [live])[0]
+
+    @staticmethod
+    def _compute_fingerprint_similarity_batch(
+        original: ElementFingerprint,
+        candidates: list[ElementFingerprint],
+    ) -> list[float]:
+        """
+        :meth:`_compute_fingerprint_similarity` of ``original`` against each
+        candidate.  Each fingerprint is normalised once (its cached
+        similarity_profile) and scores are memoised per profile pair, since
+        retries re-score the same elements.
+        """
+        oprofile = original.similarity_profile
+        return [_profile_similarity(oprofile, c.similarity_profile) for c in candidates]
+
+    @classmethod
+    def clear_caches(cls) -> None:
+        """Drop memoised similarity scores (for long-running processes)."""
+        _profile_similarity.cache_clear()
 
     async def _extract_live_fingerprint(
         self, page: Page, selector: str
@@ -672,10 +798,8 @@ class HealingEngine:
         if not candidates_raw:
             return HealingResult(success=False, explanation="No candidates from DOM")
 
-        best_score = 0.0
-        best_candidate: Optional[dict[str, Any]] = None
-        for raw in candidates_raw:
-            live_fp = ElementFingerprint(
+        live_fps = [
+            ElementFingerprint(
                 tag_name=raw.get("tag") or "",
                 element_id=raw.get("id") or "",
                 class_names=raw.get("classes") or [],
@@ -688,7 +812,13 @@ class HealingEngine:
                 href=raw.get("href") or "",
                 attributes={"data-cy": raw["dataCy"]} if raw.get("dataCy") else {},
             )
-            score = self._compute_fingerprint_similarity(fingerprint, live_fp)
+            for raw in candidates_raw
+        ]
+        scores = self._compute_fingerprint_similarity_batch(fingerprint, live_fps)
+
+        best_score = 0.0
+        best_candidate: Optional[dict[str, Any]] = None
+        for raw, score in zip(candidates_raw, scores):
             if score > best_score and score >= threshold:
                 best_score = score
                 best_candidate = raw
@@ -734,32 +864,28 @@ class HealingEngine:
         """Build a stable Playwright selector from a candidate dict. Prefer
         data-testid > data-cy > role+name > aria-label > name > placeholder > text.
         """
-        tag = (candidate.get("tag") or "").lower()
-        dt = candidate.get("dataTestid") or ""
-        dcy = candidate.get("dataCy") or ""
-        role = candidate.get("role") or ""
-        name = candidate.get("name") or ""
-        aria = candidate.get("ariaLabel") or ""
-        placeholder = candidate.get("placeholder") or ""
-        text = (candidate.get("text") or "").strip()[:80]
-
-        if dt:
-            return f'[data-testid="{dt}"]'
-        if dcy:
-            return f'[data-cy="{dcy}"]'
-        role_name = name or aria or text
+        get = candidate.get
+        for key, template in _TEST_ID_SELECTOR_RULES:
+            value = get(key)
+            if value:
+                return template.format(value)
+
+        role = get("role") or ""
+        name = get("name") or ""
+        text = (get("text") or "").strip()[:80]
         if role and role not in ("div", "span"):
+            role_name = (name or get("ariaLabel") or text)[:50]
             if role_name:
-                return f'role={role}[name="{role_name[:50]}"]'
+                return f'role={role}[name="{role_name}"]'
             return f'[role="{role}"]'
-        if name and tag in ("input", "select", "textarea", "button"):
+
+        tag = (get("tag") or "").lower()
+        if name and tag in _FORM_TAGS:
             return f'{tag}[name="{name}"]'
-        if aria:
-            return f'[aria-label="{aria}"]'
-        if name:
-            return f'[name="{name}"]'
-        if placeholder:
-            return f'[placeholder="{placeholder}"]'
+        for key, template in _ATTR_SELECTOR_RULES:
+            value = get(key)
+            if value:
+                return template.format(value)
         if text and tag:
             return f'{tag}:has-text("{text[:30]}")'
         if tag and tag != "*":
@@ -1,64 +1,86 @@
 """
 Pydantic data models for the Self-Healing Automation Engine.
 
-Defines enums, fingerprints, steps, assertions, config, and result models
-that are shared across all engine components.
+Defines fingerprints, steps, assertions, config, and result models that are
+shared across all engine components.  The enums live in engine._enums and are
+re-exported here.
 """
 
 from __future__ import annotations
 
+import hashlib
+import sys
+import time
 import uuid
 from datetime import datetime, timezone
-from enum import Enum
-from typing import Any, Optional
+from functools import cached_property
+from typing import Any, NamedTuple, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Enums live in a lightweight module; re-exported here for existing imports.
+from engine._enums import ActionType, AssertionType, HealingMode, StepStatus  # noqa: F401
 
 
 # ------------------------------------------------------------------
-# Enums
+# Timestamps
 # ------------------------------------------------------------------
 
+# (epoch milliseconds, ISO string) of the last formatted timestamp
+_last_iso: tuple[int, str] = (-1, "")
 
-class ActionType(str, Enum):
-    CLICK = "click"
-    DBLCLICK = "dblclick"
-    TYPE = "type"
-    SELECT = "select"
-    CHECK = "check"
-    UNCHECK = "uncheck"
-    HOVER = "hover"
-    KEYPRESS = "keypress"
-    SCROLL = "scroll"
-    NAVIGATE = "navigate"
 
+def now_iso() -> str:
+    """Current UTC time as ISO-8601 (millisecond precision).
 
-class HealingMode(str, Enum):
-    DISABLED = "disabled"
-    STRICT = "strict"
-    AUTO_UPDATE = "auto_update"
-    DEBUG = "debug"
+    Models created within the same millisecond share one formatted string.
+    """
+    global _last_iso
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms != _last_iso[0]:
+        _last_iso = (
+            now_ms,
+            datetime.fromtimestamp(now_ms / 1000, tz=timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+        )
+    return _last_iso[1]
 
 
-class StepStatus(str, Enum):
-    PASSED = "passed"
-    FAILED = "failed"
-    HEALED = "healed"
+# ------------------------------------------------------------------
+# Element Fingerprint
+# ------------------------------------------------------------------
 
 
-class AssertionType(str, Enum):
-    VISIBLE = "visible"
-    HIDDEN = "hidden"
-    TEXT_EQUALS = "text_equals"
-    TEXT_CONTAINS = "text_contains"
-    MATCHES_PATTERN = "matches_pattern"
-    ATTRIBUTE_EQUALS = "attribute_equals"
-    EXISTS = "exists"
+class FingerprintText(NamedTuple):
+    """Derived forms of a fingerprint's text_content."""
 
+    stripped: str
+    lower: str  # stripped, lower-cased
+    head: str  # first 80 chars of stripped (text filters / selectors)
+    words: frozenset[str]  # lower-cased words
 
-# ------------------------------------------------------------------
-# Element Fingerprint
-# ------------------------------------------------------------------
+
+class SimilarityProfile(NamedTuple):
+    """Normalised fields compared by the healer's fingerprint similarity.
+
+    Hashable, so scores can be memoised per (original, live) pair.
+    """
+
+    tag: str  # lower-cased
+    role: str  # lower-cased
+    test_id: str  # data_testid, else the data-cy attribute
+    name: str
+    text: str  # stripped, first 200 chars, lower-cased
+    text_chars: frozenset[str]  # characters of text
+    classes: frozenset[str]  # class names shorter than 40 chars
+    attrs: frozenset[tuple[str, str]]  # href/placeholder/aria-label + attributes
+
+
+# Fingerprint fields drawn from a small vocabulary (tags, roles, field names);
+# interning them lets fingerprints share one copy of each value and makes
+# equality checks on them an identity check.
+_INTERNED_FIELDS = ("tag_name", "role", "parent_tag", "data_testid", "placeholder", "name")
 
 
 class ElementFingerprint(BaseModel):
@@ -81,6 +103,74 @@ class ElementFingerprint(BaseModel):
     # Ranked selectors computed at record time (preferred > role > fallback …)
     selectors: dict[str, str] = Field(default_factory=dict)
 
+    def model_post_init(self, __context: Any) -> None:
+        # Also runs for model_construct (recorder) and model_copy.
+        values = self.__dict__
+        for key in _INTERNED_FIELDS:
+            value = values.get(key)
+            if type(value) is str:
+                values[key] = sys.intern(value)
+
+    @property
+    def preferred_selector(self) -> str:
+        """Best recorded selector: the ranked "preferred" one, else css_selector.
+
+        Not cached: healing in AUTO_UPDATE mode rewrites ``selectors``.
+        """
+        return self.selectors.get("preferred") or self.css_selector
+
+    @cached_property
+    def text_forms(self) -> FingerprintText:
+        """Stripped / lower-cased / tokenised text_content, computed once.
+
+        text_content is never rewritten after recording (healing only
+        touches the selectors), so caching is safe.
+        """
+        stripped = (self.text_content or "").strip()
+        lower = stripped.lower()
+        return FingerprintText(stripped, lower, stripped[:80], frozenset(lower.split()))
+
+    @cached_property
+    def similarity_profile(self) -> SimilarityProfile:
+        """Fields used for fingerprint similarity, normalised once.
+
+        Like text_forms, built only from fields that are never rewritten
+        after recording.
+        """
+        attributes = self.attributes or {}
+        attrs: dict[str, str] = {}
+        if self.href:
+            attrs["href"] = self.href
+        if self.placeholder:
+            attrs["placeholder"] = self.placeholder
+        if self.aria_label:
+            attrs["aria-label"] = self.aria_label
+        attrs.update(attributes)
+        text = self.text_forms.stripped[:200].lower()
+        return SimilarityProfile(
+            sys.intern((self.tag_name or "").lower()),
+            sys.intern((self.role or "").lower()),
+            self.data_testid or attributes.get("data-cy", ""),
+            self.name or "",
+            text,
+            frozenset(text),
+            frozenset(c for c in (self.class_names or []) if len(c) < 40),
+            frozenset(attrs.items()),
+        )
+
+    @cached_property
+    def stable_hash(self) -> str:
+        """Short stable hash for telemetry (no PII: text is hashed by length).
+
+        Only fields that are never rewritten after recording contribute, so
+        caching is safe.
+        """
+        key = "\x1f".join((
+            self.tag_name, self.role, self.data_testid, self.name,
+            self.aria_label, str(len(self.text_content or "")),
+        ))
+        return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
 
 # ------------------------------------------------------------------
 # Action
@@ -102,15 +192,17 @@ class Action(BaseModel):
 # ------------------------------------------------------------------
 
 
+# Empty fingerprints need no validation: model_construct just fills defaults.
+_empty_fingerprint = ElementFingerprint.model_construct
+
+
 class Assertion(BaseModel):
     assertion_id: str = Field(default_factory=lambda: uuid.uuid4().hex[:12])
     assertion_type: AssertionType = AssertionType.VISIBLE
-    fingerprint: ElementFingerprint = Field(default_factory=ElementFingerprint)
+    fingerprint: ElementFingerprint = Field(default_factory=_empty_fingerprint)
     expected_value: str = ""
     attribute_name: str = ""
-    created_at: str = Field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
-    )
+    created_at: str = Field(default_factory=now_iso)
 
 
 # ------------------------------------------------------------------
@@ -123,9 +215,7 @@ class SelectorHeal(BaseModel):
 
     original_selector: str = ""
     healed_selector: str = ""
-    healed_at: str = Field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
-    )
+    healed_at: str = Field(default_factory=now_iso)
     healing_mode: str = ""
     confidence_before: float = 0.0
     confidence_after: float = 0.0
@@ -136,14 +226,12 @@ class SelectorHeal(BaseModel):
 class TestStep(BaseModel):
     step_id: int = 0
     action: Action = Field(default_factory=Action)
-    target: ElementFingerprint = Field(default_factory=ElementFingerprint)
+    target: ElementFingerprint = Field(default_factory=_empty_fingerprint)
     assertions: list[Assertion] = Field(default_factory=list)
     selector_history: list[SelectorHeal] = Field(default_factory=list)
     screenshot_before: str = ""
     screenshot_after: str = ""
-    timestamp: str = Field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
-    )
+    timestamp: str = Field(default_factory=now_iso)
 
 
 # ------------------------------------------------------------------
@@ -157,8 +245,13 @@ class EngineConfig(BaseModel):
     llm_model: str = "gpt-4o"
     healing_mode: HealingMode = HealingMode.DISABLED
     confidence_threshold: float = 0.75
+    # resolve() skips the other strategies when a recorded selector
+    # already meets confidence_threshold
+    fast_path_precomputed: bool = True
     healing_similarity_threshold: float = 0.6
     max_healing_attempts: int = 2
+    # Healed selectors kept per HealingEngine (least recently used evicted)
+    healing_cache_max: int = Field(default=2048, ge=1)
     screenshot_on_failure: bool = True
     verbose: bool = False
     headless: bool = False
@@ -179,20 +272,22 @@ class TestModel(BaseModel):
     base_url: str = ""
     steps: list[TestStep] = Field(default_factory=list)
     config: EngineConfig = Field(default_factory=EngineConfig)
-    created_at: str = Field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
-    )
-    updated_at: str = Field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
-    )
+    created_at: str = Field(default_factory=now_iso)
+    updated_at: str = Field(default_factory=now_iso)
 
 
 # ------------------------------------------------------------------
 # Result Models (produced during execution)
 # ------------------------------------------------------------------
 
+# Results are filled in incrementally by the executor, so they stay mutable;
+# unknown fields are rejected rather than silently dropped.
+_RESULT_CONFIG = ConfigDict(extra="forbid")
+
 
 class AssertionResult(BaseModel):
+    model_config = _RESULT_CONFIG
+
     assertion_id: str = ""
     assertion_type: str = ""
     status: StepStatus = StepStatus.PASSED
@@ -202,6 +297,8 @@ class AssertionResult(BaseModel):
 
 
 class StepResult(BaseModel):
+    model_config = _RESULT_CONFIG
+
     step_id: int = 0
     status: StepStatus = StepStatus.PASSED
     element_confidence: float = 0.0
@@ -214,6 +311,8 @@ class StepResult(BaseModel):
 
 
 class TestResult(BaseModel):
+    model_config = _RESULT_CONFIG
+
     test_id: str = ""
     test_name: str = ""
     started_at: str = ""
@@ -2,19 +2,20 @@
 RecorderEngine – Captures user actions and assertions during recording.
 
 Listens for:
-  - Console messages from the injected recorder JS (clicks, inputs, keypresses).
+  - Payloads from the injected recorder JS (clicks, inputs, keypresses), passed
+    as native objects through an exposed function, with a console fallback.
   - Assertion payloads from the assertion layer (via BrowserManager callback).
   - Navigation events (suppressed when caused by a recent user action).
 """
 
 from __future__ import annotations
 
-import json
 import logging
+from collections import Counter, deque
 from datetime import datetime, timezone
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from playwright.async_api import Page
+from pydantic import BaseModel, Field, ValidationError
 
 from engine.models import (
     Action,
@@ -26,8 +27,70 @@ from engine.models import (
     TestStep,
 )
 
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
 logger = logging.getLogger(__name__)
 
+# Console fallback channel: recorder payloads are logged as PREFIX + JSON.
+_PREFIX = "__RECORDER__:"
+_PREFIX_LEN = len(_PREFIX)
+
+# Recorder JS action string → ActionType (unknown actions fall back to CLICK).
+_ACTION_MAP: dict[str, ActionType] = {
+    "click": ActionType.CLICK,
+    "dblclick": ActionType.DBLCLICK,
+    "type": ActionType.TYPE,
+    "select": ActionType.SELECT,
+    "check": ActionType.CHECK,
+    "uncheck": ActionType.UNCHECK,
+    "hover": ActionType.HOVER,
+    "keypress": ActionType.KEYPRESS,
+    "scroll": ActionType.SCROLL,
+    "navigate": ActionType.NAVIGATE,
+}
+
+
+def _identity_key(fp_data: dict[str, Any]) -> str:
+    """Key identifying the same input/field across recorded events, from a
+    raw fingerprint dict; empty when nothing identifies it."""
+    attributes = fp_data.get("attributes") or {}
+    return (
+        (fp_data.get("selectors") or {}).get("preferred", "")
+        or attributes.get("data-cy", "")
+        or attributes.get("data-testid", "")
+        or fp_data.get("data_testid")
+        or fp_data.get("name")
+        or fp_data.get("placeholder")
+        or fp_data.get("css_selector")
+        or ""
+    )
+
+
+def _fp_from_js(fp_data: dict) -> ElementFingerprint:
+    """Build a fingerprint from recorder/assertion JS output.
+
+    The injected scripts always emit well-typed fingerprints, so this skips
+    validation (model_construct).  Nulls are dropped so model defaults apply.
+    """
+    return ElementFingerprint.model_construct(
+        **{k: v for k, v in fp_data.items() if v is not None}
+    )
+
+
+class RecorderPayload(BaseModel):
+    """Action payload emitted by the injected recorder JS."""
+
+    action: str = "click"
+    # Kept raw: only validated once the event becomes a new step, so
+    # coalesced keystrokes never build a fingerprint.
+    fingerprint: dict[str, Any] = Field(default_factory=dict)
+    value: str = ""
+    url: str = ""
+    click_x: Optional[float] = None
+    click_y: Optional[float] = None
+    intent: dict[str, Any] = Field(default_factory=dict)
+
 
 class RecorderEngine:
     """Records user interactions into a TestModel."""
@@ -35,8 +98,24 @@ class RecorderEngine:
     def __init__(self, model: TestModel) -> None:
         self._model = model
         self._page: Optional[Page] = None
+        self._main_frame = None
         self._recording = False
         self._step_counter = 0
+        # Steps recorded so far; written back to the model once, in stop()
+        self._pending: deque[TestStep] = deque(model.steps)
+        # Identity key of the last pending step's target when it is a TYPE
+        # step, taken as recorded (the executor may rewrite the target's
+        # selectors later), so keystrokes coalesce without re-deriving it.
+        last = model.steps[-1] if model.steps else None
+        self._last_type_key = (
+            _identity_key(last.target.model_dump())
+            if last is not None and last.action.action_type == ActionType.TYPE
+            else ""
+        )
+        # Assertions already attached to the current step, so re-fired
+        # duplicates (e.g. a toast fading in twice) are dropped.
+        self._seen_step_id = -1
+        self._seen_assertions: set[tuple[str, str, str, str]] = set()
         # All framenavigated events are suppressed — navigations are always
         # a side-effect of user actions (click, submit) and are NOT recorded
         # as separate steps.  Assertions on the destination page attach to
@@ -50,11 +129,16 @@ class RecorderEngine:
     async def start(self, page: Page) -> None:
         """Begin recording on the given page."""
         self._page = page
+        # The main frame object is stable for the page's lifetime
+        self._main_frame = page.main_frame
         self._recording = True
-        self._step_counter = len(self._model.steps)
+        self._step_counter = len(self._pending)
         # Suppress initial redirects (e.g. http→https, www redirect)
         self._suppress_nav = True
 
+        # Payloads arrive as native dicts via the exposed function; the
+        # console channel is only used when the function is unavailable.
+        await page.expose_function("__AUTOMATE_REC__", self._on_payload)
         page.on("console", self._handle_console)
         page.on("framenavigated", self._handle_navigation)
 
@@ -63,9 +147,20 @@ class RecorderEngine:
     def stop(self) -> TestModel:
         """Stop recording and return the final model."""
         self._recording = False
+        self._model.steps = list(self._pending)
         logger.info("Recorder stopped – %d steps captured", len(self._model.steps))
+        counts = self.assertion_counts()
+        if counts:
+            logger.info(
+                "Assertions captured: %s",
+                ", ".join(f"{t.value}={n}" for t, n in counts.most_common()),
+            )
         return self._model
 
+    def assertion_counts(self) -> Counter[AssertionType]:
+        """Number of recorded assertions per type, in a single pass."""
+        return Counter(a.assertion_type for step in self._pending for a in step.assertions)
+
     def handle_assertion(self, payload: dict) -> None:
         """
         Called by BrowserManager when an assertion is received from the JS layer.
@@ -80,112 +175,156 @@ class RecorderEngine:
 
         assertion_type = payload.get("assertion_type", "visible")
         fp_data = payload.get("fingerprint", {})
+        expected_value = payload.get("value", "")
+        attribute_name = payload.get("attribute_name", "")
+
+        if self._is_duplicate_assertion(assertion_type, fp_data, expected_value, attribute_name):
+            logger.debug("Skipped duplicate assertion '%s'", assertion_type)
+            return
 
         assertion = Assertion(
             assertion_type=AssertionType(assertion_type),
-            fingerprint=ElementFingerprint(**fp_data),
-            expected_value=payload.get("value", ""),
-            attribute_name=payload.get("attribute_name", ""),
+            fingerprint=_fp_from_js(fp_data),
+            expected_value=expected_value,
+            attribute_name=attribute_name,
         )
 
-        if self._model.steps:
-            self._model.steps[-1].assertions.append(assertion)
-            logger.info(
-                "Assertion '%s' attached to step %d",
-                assertion_type,
-                self._model.steps[-1].step_id,
-            )
+        if self._pending:
+            last = self._pending[-1]
+            last.assertions.append(assertion)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Assertion '%s' attached to step %d",
+                    assertion_type,
+                    last.step_id,
+                )
         else:
             step = self._new_step(
                 action=Action(action_type=ActionType.CLICK),
-                fingerprint=ElementFingerprint(**fp_data),
+                # Own copy: the target may be rewritten by AUTO_UPDATE healing
+                fingerprint=assertion.fingerprint.model_copy(deep=True),
             )
             step.assertions.append(assertion)
-            self._model.steps.append(step)
+            self._pending.append(step)
             logger.info("Assertion '%s' created new step %d", assertion_type, step.step_id)
 
+    def _is_duplicate_assertion(
+        self, assertion_type: str, fp_data: dict, expected_value: str, attribute_name: str
+    ) -> bool:
+        """True if the same assertion was already attached to the step it
+        would go on; otherwise remember it.  Elements without an identity
+        key are never treated as duplicates."""
+        identity = _identity_key(fp_data)
+        if not identity:
+            return False
+
+        step_id = self._pending[-1].step_id if self._pending else self._step_counter + 1
+        if step_id != self._seen_step_id:
+            self._seen_step_id = step_id
+            self._seen_assertions.clear()
+
+        key = (assertion_type, identity, expected_value, attribute_name)
+        if key in self._seen_assertions:
+            return True
+        self._seen_assertions.add(key)
+        return False
+
     # ------------------------------------------------------------------
-    # Console message handler
+    # Recorder payload handlers
     # ------------------------------------------------------------------
 
+    def _on_payload(self, data: dict) -> None:
+        """Receive a payload object from the recorder JS (exposed function)."""
+        if not self._recording:
+            return
+
+        try:
+            payload = RecorderPayload.model_validate(data)
+        except ValidationError:
+            logger.warning("Invalid recorder payload: %s", str(data)[:200])
+            return
+
+        self._record_payload(payload)
+
     def _handle_console(self, msg) -> None:
-        """Parse console messages from the recorder JS."""
+        """Parse console messages from the recorder JS (fallback channel)."""
         if not self._recording:
             return
 
+        # The recorder JS only emits via console.log; skip warnings/errors/etc.
+        if msg.type != "log":
+            return
+
         text: str = msg.text
-        if not text.startswith("__RECORDER__:"):
+        if not text.startswith(_PREFIX):
             return
 
+        # Parse and validate in a single pass (fingerprint included)
         try:
-            data = json.loads(text[len("__RECORDER__:"):])
-        except json.JSONDecodeError:
+            data = RecorderPayload.model_validate_json(text[_PREFIX_LEN:])
+        except ValidationError:
             logger.warning("Invalid recorder payload: %s", text[:200])
             return
 
-        action_str = data.get("action", "click")
-        fp_data = data.get("fingerprint", {})
-        value = data.get("value", "")
-        url = data.get("url", "")
+        self._record_payload(data)
 
-        action_type = self._map_action_type(action_str)
-        fingerprint = ElementFingerprint(**fp_data)
-
-        intent_data = data.get("intent", {})
+    def _record_payload(self, data: RecorderPayload) -> None:
+        """Turn a recorder payload into a new (or coalesced) step."""
+        value = data.value
+        action_type = self._map_action_type(data.action)
+        fp_data = data.fingerprint
 
         # Coalesce type: if last step is type on same field and new value extends old, update it
-        if action_type == ActionType.TYPE and self._model.steps:
-            last = self._model.steps[-1]
+        if action_type == ActionType.TYPE and self._pending:
+            last = self._pending[-1]
+            prev = last.action.value
+            # Same value, or a strict extension of it (checked cheaply by
+            # length before comparing contents)
+            extends = value == prev or (len(value) > len(prev) and value.startswith(prev))
             if (
-                last.action.action_type == ActionType.TYPE
-                and self._same_target(last.target, fingerprint)
-                and (last.action.value == value or (value and value.startswith(last.action.value)))
+                extends
+                and last.action.action_type == ActionType.TYPE
+                and self._same_target(fp_data)
             ):
                 last.action.value = value
                 self._suppress_nav = True
-                logger.info(
-                    "Coalesced type step: value updated to %r (step %d)",
-                    value[:50],
-                    last.step_id,
-                )
+                # Per-keystroke path: skip building log args when INFO is off
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Coalesced type step: value updated to %r (step %d)",
+                        value[:50],
+                        last.step_id,
+                    )
                 return
 
+        fingerprint = _fp_from_js(fp_data)
+
         action = Action(
             action_type=action_type,
             value=value,
-            url=url,
-            click_x=data.get("click_x"),
-            click_y=data.get("click_y"),
-            intent=intent_data,
+            url=data.url,
+            click_x=data.click_x,
+            click_y=data.click_y,
+            intent=data.intent,
         )
         step = self._new_step(action=action, fingerprint=fingerprint)
-        self._model.steps.append(step)
+        self._pending.append(step)
+        self._last_type_key = _identity_key(fp_data) if action_type == ActionType.TYPE else ""
         self._suppress_nav = True
 
-        preferred = fingerprint.selectors.get("preferred", fingerprint.css_selector)
-        logger.info(
-            "Recorded step %d: %s (selector=%s)",
-            step.step_id,
-            action_type.value,
-            preferred,
-        )
-
-    @staticmethod
-    def _same_target(a: ElementFingerprint, b: ElementFingerprint) -> bool:
-        """True if both fingerprints refer to the same input/field."""
-        def key(fp: ElementFingerprint) -> str:
-            return (
-                fp.selectors.get("preferred", "")
-                or fp.attributes.get("data-cy", "")
-                or fp.attributes.get("data-testid", "")
-                or fp.data_testid
-                or fp.name
-                or fp.placeholder
-                or fp.css_selector
-                or ""
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Recorded step %d: %s (selector=%s)",
+                step.step_id,
+                action_type.value,
+                fingerprint.preferred_selector,
             )
-        ka, kb = key(a), key(b)
-        return bool(ka and kb and ka == kb)
+
+    def _same_target(self, fp_data: dict) -> bool:
+        """True if a raw fingerprint dict refers to the same input/field as
+        the last (TYPE) step."""
+        key = self._last_type_key
+        return bool(key and key == _identity_key(fp_data))
 
     # ------------------------------------------------------------------
     # Navigation handler
@@ -200,7 +339,7 @@ class RecorderEngine:
         if not self._recording:
             return
 
-        if frame != self._page.main_frame:
+        if frame is not self._main_frame:
             return
 
         url = frame.url
@@ -212,8 +351,8 @@ class RecorderEngine:
             return
 
         # Avoid duplicate consecutive navigations to the same URL
-        if self._model.steps:
-            last = self._model.steps[-1]
+        if self._pending:
+            last = self._pending[-1]
             if (
                 last.action.action_type == ActionType.NAVIGATE
                 and last.action.url == url
@@ -221,16 +360,21 @@ class RecorderEngine:
                 return
 
         action = Action(action_type=ActionType.NAVIGATE, url=url)
-        step = self._new_step(action=action, fingerprint=ElementFingerprint())
-        self._model.steps.append(step)
+        step = self._new_step(action=action)
+        self._pending.append(step)
         logger.info("Recorded navigation → %s (step %d)", url, step.step_id)
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
-    def _new_step(self, action: Action, fingerprint: ElementFingerprint) -> TestStep:
+    def _new_step(
+        self, action: Action, fingerprint: Optional[ElementFingerprint] = None
+    ) -> TestStep:
         self._step_counter += 1
+        if fingerprint is None:
+            # Target-less steps (navigation) use the model's empty default
+            return TestStep(step_id=self._step_counter, action=action)
         return TestStep(
             step_id=self._step_counter,
             action=action,
@@ -239,16 +383,4 @@ class RecorderEngine:
 
     @staticmethod
     def _map_action_type(action_str: str) -> ActionType:
-        mapping = {
-            "click": ActionType.CLICK,
-            "dblclick": ActionType.DBLCLICK,
-            "type": ActionType.TYPE,
-            "select": ActionType.SELECT,
-            "check": ActionType.CHECK,
-            "uncheck": ActionType.UNCHECK,
-            "hover": ActionType.HOVER,
-            "keypress": ActionType.KEYPRESS,
-            "scroll": ActionType.SCROLL,
-            "navigate": ActionType.NAVIGATE,
-        }
-        return mapping.get(action_str, ActionType.CLICK)
+        return _ACTION_MAP.get(action_str, ActionType.CLICK)
@@ -4,7 +4,7 @@ SelectorEngine – Resolves element selectors with confidence scoring.
 Implements the 5-factor confidence algorithm:
     Confidence = 0.4*T + 0.2*R + 0.15*A + 0.15*P + 0.1*D
 
-Strategies (evaluated in order, best confidence wins):
+Strategies (evaluated concurrently, best confidence wins; earlier ones win ties):
   1. data-testid (exact unique match)
   2. data-testid + tag (composite)
   3. data-cy / data-test / data-qa (common test attributes)
@@ -21,17 +21,29 @@ Strategies (evaluated in order, best confidence wins):
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
+import sys
+import time
+from contextvars import ContextVar
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 from typing import Optional
 
 from playwright.async_api import Locator, Page
 
-from engine.models import ElementFingerprint, EngineConfig
+from engine.models import ElementFingerprint, EngineConfig, FingerprintText
 
 logger = logging.getLogger(__name__)
 
+# Both patterns below are start-anchored with bounded or non-overlapping
+# quantifiers; the one overlapping pair ([a-z_-]*[0-9a-f]{8,}) has no end
+# anchor, so each backtracking step inspects at most 8 characters.
+# Matching therefore stays linear even for hostile class names / ids (no
+# need for a DFA engine such as RE2).
+
 # CSS-in-JS / CSS Modules patterns: these class names are regenerated on
 # every build so they must never be trusted for stable selection.
 _DYNAMIC_CLASS_RE = re.compile(
@@ -51,8 +63,135 @@ _DYNAMIC_ID_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Ids usable as a bare "#id" compound selector (no escaping, no combinators).
+_CSS_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*\Z")
+
 # Common testing-library attribute names (in priority order).
 _TEST_ATTRS = ["data-cy", "data-test", "data-qa", "data-test-id", "data-testid"]
+_TEST_ATTR_SET = frozenset(_TEST_ATTRS)
+
+
+# Selector templates (%-formatted; the structural parts are shared constants)
+_ATTR_SEL = "%s[%s=%s]"             # tag, attribute, quoted value
+_ID_SEL = "#%s"
+_ROLE_SEL = "role=%s"
+_ROLE_NAME_SEL = "role=%s[name=%s]"
+_TEXT_SEL = "text=%s"
+_TAG_TEXT_SEL = "%s:has-text(%s)"
+_PLACEHOLDER_SEL = "placeholder=%s"
+_XPATH_SEL = "xpath=%s"
+_PLUS_TEXT_SEL = "%s + text"        # narrowed by text (descriptive only)
+_NTH_SEL = "%s >> nth=%d"
+
+# Counts several CSS selectors in one evaluate() round-trip.  Open shadow
+# roots are searched too, which matches Playwright's CSS engine for the
+# compound attribute selectors (no combinators) this is used with.
+# Invalid selectors count as -1.
+_BATCH_COUNT_JS = """
+sels => {
+    const roots = [];
+    const collect = root => {
+        roots.push(root);
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT);
+        for (let n = walker.nextNode(); n; n = walker.nextNode()) {
+            if (n.shadowRoot) collect(n.shadowRoot);
+        }
+    };
+    collect(document);
+    return sels.map(s => {
+        try {
+            let count = 0;
+            for (const root of roots) count += root.querySelectorAll(s).length;
+            return count;
+        } catch (e) {
+            return -1;
+        }
+    });
+}
+"""
+
+# selector → count prefetched for the strategies of the current
+# _generate_candidates call (strategy tasks inherit the context).
+_prefetched_counts: ContextVar[Optional[dict[str, int]]] = ContextVar(
+    "_prefetched_counts", default=None
+)
+
+# Candidate sort key (C-level attribute fetch)
+_by_confidence = attrgetter("confidence")
+
+
+def _weighted_confidence(
+    t: float = 0.0, r: float = 0.0, a: float = 0.0, p: float = 0.5, d: float = 0.5
+) -> float:
+    """Confidence = 0.4*T + 0.2*R + 0.15*A + 0.15*P + 0.1*D (capped at 1.0)."""
+    score = 0.4 * t + 0.2 * r + 0.15 * a + 0.15 * p + 0.1 * d
+    return round(min(score, 1.0), 4)
+
+
+# (T, R, A, P, D) factor scores for each strategy outcome.  They are fixed
+# per outcome, so the live confidences are folded into constants at import.
+_STRATEGY_FACTORS: dict[str, tuple[float, float, float, float, float]] = {
+    "data-testid": (1.0, 0.8, 0.9, 0.8, 0.7),
+    "testid+tag": (0.95, 0.7, 0.9, 0.7, 0.7),
+    "testid+tag+text": (0.85, 0.6, 0.8, 0.7, 0.6),
+    "testid+tag+first": (0.8, 0.5, 0.7, 0.8, 0.5),
+    "test-attr": (1.0, 0.8, 0.9, 0.8, 0.7),
+    "test-attr+text": (0.9, 0.7, 0.85, 0.7, 0.6),
+    "test-attr+tag": (0.95, 0.7, 0.9, 0.7, 0.7),
+    "test-attr+tag+text": (0.85, 0.6, 0.8, 0.7, 0.6),
+    "id": (0.95, 0.7, 0.8, 0.7, 0.7),
+    "name": (0.85, 0.7, 0.85, 0.7, 0.6),
+    "role+name": (0.7, 1.0, 0.7, 0.7, 0.6),
+    "aria+tag": (0.7, 0.95, 0.85, 0.7, 0.6),
+    "aria-label": (0.6, 0.9, 0.8, 0.5, 0.5),
+    "text-exact": (0.5, 0.6, 0.7, 0.6, 0.5),
+    "tag+text": (0.45, 0.5, 0.65, 0.6, 0.5),
+    "placeholder": (0.85, 0.7, 0.9, 0.7, 0.6),
+    "css [dynamic]": (0.3, 0.3, 0.4, 0.5, 0.5),
+    "css": (0.5, 0.5, 0.8, 0.5, 0.5),
+    "css+text": (0.5, 0.5, 0.75, 0.6, 0.5),
+    "css+nth [dynamic]": (0.2, 0.2, 0.3, 0.6, 0.4),
+    "css+nth": (0.4, 0.4, 0.6, 0.8, 0.5),
+    "xpath": (0.3, 0.3, 0.5, 0.7, 0.9),
+}
+_STRATEGY_CONF: dict[str, float] = {
+    key: _weighted_confidence(*factors) for key, factors in _STRATEGY_FACTORS.items()
+}
+
+
+# resolve() hands its full candidate scan to an immediately following
+# resolve_candidates() for the same page and fingerprint (the executor's
+# "best, then fallbacks" sequence).  Older scans are never reused, since
+# the executor polls while the page is still rendering.
+_HANDOFF_MAX_AGE_S = 0.25
+
+
+@lru_cache(maxsize=4096)
+def _quote(value: str) -> str:
+    """Double-quoted selector string with ``\\`` and ``"`` escaped, and line
+    breaks written as CSS escapes (a raw newline ends a CSS string), so
+    recorded values cannot break the selector."""
+    return '"%s"' % (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\a ")
+        .replace("\r", "\\d ")
+    )
+
+
+@lru_cache(maxsize=4096)
+def _attr_selector(attr: str, value: str, tag: str = "") -> str:
+    """``tag[attr="value"]`` — cached, as the same fingerprints are resolved
+    on every retry."""
+    return _ATTR_SEL % (tag, attr, _quote(value))
+
+
+def _id_selector(element_id: str) -> str:
+    """``#id`` for plain identifiers, ``[id="..."]`` for anything else
+    (spaces, leading digits, ``:`` ...), which ``#`` would misparse."""
+    if _CSS_IDENT_RE.match(element_id):
+        return _ID_SEL % element_id
+    return _attr_selector("id", element_id)
 
 
 @dataclass
@@ -70,6 +209,13 @@ class SelectorEngine:
 
     def __init__(self, config: EngineConfig) -> None:
         self._config = config
+        # id(page) → selector → Locator, dropped when the page closes
+        self._locator_cache: dict[int, dict[str, Locator]] = {}
+        # Last full scan from resolve(): (page, fingerprint, css_selector,
+        # monotonic time, candidates).  Consumed by resolve_candidates().
+        self._handoff: Optional[
+            tuple[Page, ElementFingerprint, str, float, list[SelectorCandidate]]
+        ] = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -86,7 +232,16 @@ class SelectorEngine:
         candidate whose live text doesn't overlap is rejected so we
         never return a completely wrong element.
         """
-        candidates = await self._generate_candidates(page, fingerprint)
+        fast_path = self._config.fast_path_precomputed
+        candidates = await self._scan(page, fingerprint, fast_path)
+        # A lone candidate may be a fast-path result (other strategies
+        # skipped), which resolve_candidates() must not reuse.
+        full_scan = not fast_path or len(candidates) > 1
+        self._handoff = (
+            (page, fingerprint, fingerprint.css_selector, time.monotonic(), candidates)
+            if full_scan
+            else None
+        )
 
         if not candidates:
             logger.warning(
@@ -94,28 +249,8 @@ class SelectorEngine:
             )
             return None
 
-        # Text-validation: reject candidates whose text has zero overlap
-        # with the fingerprint's text_content.
-        fp_text = (fingerprint.text_content or "").strip()
-        if fp_text:
-            validated: list[SelectorCandidate] = []
-            for c in candidates:
-                try:
-                    live_text = (await c.locator.text_content(timeout=2000) or "").strip()
-                except Exception:
-                    live_text = ""
-                if self._text_overlaps(fp_text, live_text):
-                    validated.append(c)
-                else:
-                    logger.debug(
-                        "Rejected candidate %s — text '%s' doesn't match fingerprint '%s'",
-                        c.selector, live_text[:60], fp_text[:60],
-                    )
-            if validated:
-                candidates = validated
-
-        candidates.sort(key=lambda c: c.confidence, reverse=True)
-        best = candidates[0]
+        # max() keeps the first of equal scores, as the stable sort did
+        best = max(candidates, key=_by_confidence)
 
         logger.info(
             "Best candidate: %s (confidence=%.2f, strategy=%s)",
@@ -138,34 +273,74 @@ class SelectorEngine:
     ) -> list[SelectorCandidate]:
         """Return all validated candidates sorted by confidence (best first).
         Used by executor to try fallback candidates when the best one fails.
-        """
-        candidates = await self._generate_candidates(page, fingerprint)
-        if not candidates:
-            return []
 
-        fp_text = (fingerprint.text_content or "").strip()
-        if fp_text:
-            validated: list[SelectorCandidate] = []
-            for c in candidates:
-                try:
-                    live_text = (await c.locator.text_content(timeout=2000) or "").strip()
-                except Exception:
-                    live_text = ""
-                if self._text_overlaps(fp_text, live_text):
-                    validated.append(c)
-            if validated:
-                candidates = validated
+        Reuses the scan of an immediately preceding ``resolve`` call for
+        the same page and fingerprint.
+        """
+        handoff, self._handoff = self._handoff, None
+        if (
+            handoff is not None
+            and handoff[0] is page
+            and handoff[1] is fingerprint
+            and handoff[2] == fingerprint.css_selector
+            and time.monotonic() - handoff[3] <= _HANDOFF_MAX_AGE_S
+        ):
+            candidates = handoff[4]
+        else:
+            candidates = await self._scan(page, fingerprint, fast_path=False)
+        return sorted(candidates, key=_by_confidence, reverse=True)
 
-        candidates.sort(key=lambda c: c.confidence, reverse=True)
+    async def _scan(
+        self, page: Page, fingerprint: ElementFingerprint, fast_path: bool
+    ) -> list[SelectorCandidate]:
+        """Generate candidates and apply the text post-filter: candidates
+        whose text has zero overlap with the fingerprint's text_content
+        are rejected (unless none would remain)."""
+        candidates = await self._generate_candidates(page, fingerprint, fast_path=fast_path)
+        if candidates and fingerprint.text_forms.stripped:
+            candidates = await self._validate_by_text(candidates, fingerprint.text_forms)
         return candidates
 
+    async def _validate_by_text(
+        self, candidates: list[SelectorCandidate], fp_text: FingerprintText
+    ) -> list[SelectorCandidate]:
+        """Keep the candidates whose live text overlaps the fingerprint text.
+
+        Live texts are fetched concurrently.  If no candidate passes, the
+        list is returned unchanged (so a single candidate needs no check).
+        """
+        if len(candidates) < 2:
+            return candidates
+        texts = await asyncio.gather(*(self._live_text(c.locator) for c in candidates))
+        validated: list[SelectorCandidate] = []
+        for c, live_text in zip(candidates, texts):
+            if self._text_overlaps(fp_text.stripped, live_text, fp_text.words):
+                validated.append(c)
+            else:
+                logger.debug(
+                    "Rejected candidate %s — text '%s' doesn't match fingerprint '%s'",
+                    c.selector, live_text[:60], fp_text.stripped[:60],
+                )
+        return validated or candidates
+
     @staticmethod
-    def _text_overlaps(expected: str, actual: str) -> bool:
+    async def _live_text(locator: Locator) -> str:
+        """Stripped text_content of the locator, or "" if it can't be read."""
+        try:
+            return (await locator.text_content(timeout=2000) or "").strip()
+        except Exception:
+            return ""
+
+    @staticmethod
+    def _text_overlaps(
+        expected: str, actual: str, expected_words: Optional[frozenset[str]] = None
+    ) -> bool:
         """Check if the actual text has meaningful overlap with expected.
 
         Uses word-level intersection — at least 40% of the expected
         words must appear in the actual text.  Single-word texts must
-        match exactly (case-insensitive).
+        match exactly (case-insensitive).  ``expected_words`` may pass the
+        already-split lower-cased words of ``expected``.
         """
         if not expected:
             return True
@@ -176,14 +351,13 @@ class SelectorEngine:
         # Exact substring match
         if e_lower in a_lower or a_lower in e_lower:
             return True
-        # Word-level overlap
-        e_words = set(e_lower.split())
-        a_words = set(a_lower.split())
+        # Word-level overlap (intersection() consumes the split list
+        # directly, so no set is built for the usually longer actual text)
+        e_words = expected_words if expected_words is not None else set(e_lower.split())
         if not e_words:
             return True
-        overlap = len(e_words & a_words)
-        ratio = overlap / len(e_words)
-        return ratio >= 0.4
+        overlap = len(e_words.intersection(a_lower.split()))
+        return overlap / len(e_words) >= 0.4
 
     def compute_confidence(self, fingerprint: ElementFingerprint) -> float:
         """
@@ -191,14 +365,140 @@ class SelectorEngine:
 
         Confidence = 0.4*T + 0.2*R + 0.15*A + 0.15*P + 0.1*D
         """
-        t = self._score_test_id(fingerprint)
-        r = self._score_role(fingerprint)
-        a = self._score_attributes(fingerprint)
-        p = self._score_positional(fingerprint)
-        d = self._score_dom_structure(fingerprint)
+        # Factor scores T (test id), R (role), A (attributes), P (position)
+        # and D (DOM path), computed inline so each field is read once.
+        # Neither A (max 1.0) nor the total (max 0.92) can exceed 1.0, so
+        # no min(..., 1.0) caps are needed.
+        fp = fingerprint
+        role = fp.role
+        aria_label = fp.aria_label
 
-        score = 0.4 * t + 0.2 * r + 0.15 * a + 0.15 * p + 0.1 * d
-        return round(min(score, 1.0), 4)
+        if fp.data_testid:
+            t = 1.0
+        elif fp.element_id:
+            t = 0.9
+        else:
+            t = 0.6 if fp.name else 0.0
+
+        if role:
+            r = 1.0 if aria_label else 0.7
+        else:
+            r = 0.5 if aria_label else 0.0
+
+        a = 0.0
+        if fp.placeholder:
+            a += 0.3
+        if fp.href:
+            a += 0.2
+        if fp.class_names:
+            a += 0.2
+        if fp.attributes:
+            a += min(len(fp.attributes) * 0.05, 0.3)
+
+        p = 0.6 if fp.parent_tag else 0.2
+
+        if fp.xpath:
+            d = 0.8
+        else:
+            d = 0.5 if fp.css_selector else 0.1
+
+        return round(0.4 * t + 0.2 * r + 0.15 * a + 0.15 * p + 0.1 * d, 4)
+
+    def _get_locator(self, page: Page, selector: str) -> Locator:
+        """``page.locator(selector)``, reusing the Locator across retries."""
+        page_key = id(page)
+        per_page = self._locator_cache.get(page_key)
+        if per_page is None:
+            per_page = self._locator_cache[page_key] = {}
+            page.once("close", lambda _: self._locator_cache.pop(page_key, None))
+        locator = per_page.get(selector)
+        if locator is None:
+            locator = per_page[selector] = page.locator(selector)
+        return locator
+
+    @staticmethod
+    async def _count(selector: str, locator: Locator) -> int:
+        """Match count for ``selector`` — prefetched if available, else
+        ``locator.count()``."""
+        prefetched = _prefetched_counts.get()
+        if prefetched:
+            count = prefetched.get(selector)
+            if count is not None:
+                return count
+        return await locator.count()
+
+    async def _quick_unique_match(self, page: Page, selector: str) -> bool:
+        """True if ``selector`` matches exactly one element.
+
+        Answered from the prefetched batch count when available, so no
+        Locator is created on the (common) rejection path.
+        """
+        prefetched = _prefetched_counts.get()
+        if prefetched:
+            count = prefetched.get(selector)
+            if count is not None:
+                return count == 1
+        return await self._get_locator(page, selector).count() == 1
+
+    async def _count_all(self, probes: list[tuple[str, Locator]]) -> list:
+        """``_count`` every (selector, locator) concurrently (failures are
+        returned as the exception, in place of the count)."""
+        return await asyncio.gather(
+            *(self._count(sel, locator) for sel, locator in probes),
+            return_exceptions=True,
+        )
+
+    @staticmethod
+    async def _batch_count(page: Page, selectors: list[str]) -> list[int]:
+        """Count each CSS selector on the page in a single round-trip
+        (-1 for an invalid selector)."""
+        return await page.evaluate(_BATCH_COUNT_JS, selectors)
+
+    async def _prefetch_counts(self, page: Page, fp: ElementFingerprint) -> dict[str, int]:
+        """Batch-count the attribute selectors the strategies will probe.
+
+        Selectors that fail to count are left out, so the strategy falls
+        back to (and fails on) its own ``count()``.
+        """
+        selectors = self._attr_probe_selectors(fp)
+        if not selectors:
+            return {}
+        try:
+            counts = await self._batch_count(page, selectors)
+        except Exception as e:
+            logger.debug("Batch count failed: %s", e)
+            return {}
+        return {sel: n for sel, n in zip(selectors, counts) if n >= 0}
+
+    @staticmethod
+    def _attr_probe_selectors(fp: ElementFingerprint) -> list[str]:
+        """The ``[attr="value"]`` / ``#id`` selectors probed by the testid,
+        test-attr, id, name and aria-label strategies (role/text/CSS/XPath
+        selectors need Playwright's own engines and are not batched)."""
+        selectors: list[str] = []
+        tag = fp.tag_name
+        eid = fp.element_id
+        if eid and not _DYNAMIC_ID_RE.match(eid):
+            selectors.append(_id_selector(eid))
+        if fp.data_testid:
+            selectors.append(_attr_selector("data-testid", fp.data_testid))
+            if tag:
+                selectors.append(_attr_selector("data-testid", fp.data_testid, tag))
+        attributes = fp.attributes
+        if attributes and not _TEST_ATTR_SET.isdisjoint(attributes):
+            for attr in _TEST_ATTRS:
+                val = attributes.get(attr)
+                if val:
+                    selectors.append(_attr_selector(attr, val))
+                    if tag:
+                        selectors.append(_attr_selector(attr, val, tag))
+        if fp.name:
+            selectors.append(_attr_selector("name", fp.name, tag))
+        if fp.aria_label:
+            if tag:
+                selectors.append(_attr_selector("aria-label", fp.aria_label, tag))
+            selectors.append(_attr_selector("aria-label", fp.aria_label))
+        return selectors
 
     # ------------------------------------------------------------------
     # Dynamic-class detection
@@ -212,7 +512,8 @@ class SelectorEngine:
     def _has_only_dynamic_classes(fp: ElementFingerprint) -> bool:
         if not fp.class_names:
             return False
-        return all(SelectorEngine._is_dynamic_class(c) for c in fp.class_names)
+        # map() avoids a generator frame and a class lookup per name
+        return all(map(SelectorEngine._is_dynamic_class, fp.class_names))
 
     # ------------------------------------------------------------------
     # Candidate generation
@@ -229,56 +530,59 @@ class SelectorEngine:
         """When a locator matches multiple elements, use the fingerprint's
         text_content to narrow it down to the exact one.  Returns a
         single-element locator or None if text didn't help."""
-        text = (fp.text_content or "").strip()
+        text = fp.text_forms.head  # first 80 chars: avoids overly-long selectors
         if not text:
             return None
-        # Use the first 80 chars to avoid overly-long selectors
-        filtered = locator.filter(has_text=text[:80])
+        filtered = locator.filter(has_text=text)
         if await filtered.count() == 1:
             return filtered
         # Try exact match via get_by_text within the locator
-        exact = locator.get_by_text(text[:80], exact=True)
+        exact = locator.get_by_text(text, exact=True)
         if await exact.count() == 1:
             return exact
         return None
 
     async def _generate_candidates(
-        self, page: Page, fp: ElementFingerprint
+        self, page: Page, fp: ElementFingerprint, fast_path: bool = False
     ) -> list[SelectorCandidate]:
         """Generate candidates using multiple selector strategies.
 
         When the fingerprint carries pre-computed ``selectors`` (recorded
         at capture time), those are tried first with high confidence.
+        With ``fast_path``, a pre-computed match that already meets the
+        confidence threshold (and passes the text check) is returned alone.
         """
         candidates: list[SelectorCandidate] = []
 
         # Pre-computed selectors from recording (highest priority)
         precomputed = await self._strategy_precomputed(page, fp)
         if precomputed:
+            if fast_path and precomputed.confidence >= self._config.confidence_threshold:
+                fp_text = fp.text_forms
+                if not fp_text.stripped or self._text_overlaps(
+                    fp_text.stripped, await self._live_text(precomputed.locator), fp_text.words
+                ):
+                    return [precomputed]
             candidates.append(precomputed)
 
-        strategies = [
-            ("data-testid", self._strategy_testid),
-            ("testid+tag", self._strategy_testid_tag),
-            ("data-cy", self._strategy_test_attr),
-            ("id", self._strategy_id),
-            ("name", self._strategy_name),
-            ("role+name", self._strategy_role),
-            ("aria-label", self._strategy_aria),
-            ("placeholder", self._strategy_placeholder),
-            ("text-exact", self._strategy_text),
-            ("tag+text", self._strategy_tag_text),
-            ("css", self._strategy_css),
-            ("xpath", self._strategy_xpath),
-        ]
-
-        for name, strategy_fn in strategies:
-            try:
-                result = await strategy_fn(page, fp)
-                if result:
-                    candidates.append(result)
-            except Exception as e:
-                logger.debug("Strategy %s failed: %s", name, e)
+        # One round-trip counts the plain attribute selectors probed below
+        token = _prefetched_counts.set(await self._prefetch_counts(page, fp))
+
+        # Strategies are independent reads of the same page: run them
+        # concurrently so their Playwright round-trips overlap.  Results
+        # keep strategy order, which breaks confidence ties.
+        try:
+            results = await asyncio.gather(
+                *(strategy_fn(self, page, fp) for _, strategy_fn in self._STRATEGIES),
+                return_exceptions=True,
+            )
+        finally:
+            _prefetched_counts.reset(token)
+        for (name, _), result in zip(self._STRATEGIES, results):
+            if isinstance(result, BaseException):
+                logger.debug("Strategy %s failed: %s", name, result)
+            elif result:
+                candidates.append(result)
 
         return candidates
 
@@ -308,33 +612,42 @@ class SelectorEngine:
         if not fp.selectors:
             return None
 
+        entries: list[tuple[str, str, Locator]] = []
         for key in self._PRECOMPUTED_PRIORITY:
             sel = fp.selectors.get(key)
             if not sel:
                 continue
             try:
-                locator = page.locator(sel)
-                count = await locator.count()
-                base_conf = self._PRECOMPUTED_CONFIDENCE.get(key, 0.5)
-                if count == 1:
-                    return SelectorCandidate(
-                        locator=locator,
-                        selector=sel,
-                        confidence=base_conf,
-                        strategy=f"precomputed-{key}",
-                    )
-                if count > 1:
-                    narrowed = await self._narrow_by_text(locator, fp)
-                    if narrowed:
-                        return SelectorCandidate(
-                            locator=narrowed,
-                            selector=f"{sel} + text",
-                            confidence=round(base_conf * 0.9, 2),
-                            strategy=f"precomputed-{key}+text",
-                        )
+                entries.append((key, sel, self._get_locator(page, sel)))
             except Exception:
                 continue
 
+        # Probe every recorded selector at once, then pick by priority
+        counts = await self._count_all([(sel, locator) for _, sel, locator in entries])
+        for (key, sel, locator), count in zip(entries, counts):
+            if isinstance(count, BaseException):
+                continue
+            base_conf = self._PRECOMPUTED_CONFIDENCE.get(key, 0.5)
+            if count == 1:
+                return SelectorCandidate(
+                    locator=locator,
+                    selector=sel,
+                    confidence=base_conf,
+                    strategy=sys.intern("precomputed-" + key),
+                )
+            if count > 1:
+                try:
+                    narrowed = await self._narrow_by_text(locator, fp)
+                except Exception:
+                    continue
+                if narrowed:
+                    return SelectorCandidate(
+                        locator=narrowed,
+                        selector=_PLUS_TEXT_SEL % sel,
+                        confidence=round(base_conf * 0.9, 2),
+                        strategy=sys.intern("precomputed-%s+text" % key),
+                    )
+
         return None
 
     # ------------------------------------------------------------------
@@ -346,13 +659,12 @@ class SelectorEngine:
     ) -> Optional[SelectorCandidate]:
         if not fp.data_testid:
             return None
-        selector = f'[data-testid="{fp.data_testid}"]'
-        locator = page.locator(selector)
-        if await locator.count() == 1:
+        selector = _attr_selector("data-testid", fp.data_testid)
+        if await self._quick_unique_match(page, selector):
             return SelectorCandidate(
-                locator=locator,
+                locator=self._get_locator(page, selector),
                 selector=selector,
-                confidence=self._compute_live_confidence(fp, t=1.0, r=0.8, a=0.9, p=0.8, d=0.7),
+                confidence=_STRATEGY_CONF["data-testid"],
                 strategy="data-testid",
             )
         return None
@@ -366,14 +678,14 @@ class SelectorEngine:
     ) -> Optional[SelectorCandidate]:
         if not fp.data_testid or not fp.tag_name:
             return None
-        selector = f'{fp.tag_name}[data-testid="{fp.data_testid}"]'
-        locator = page.locator(selector)
-        count = await locator.count()
+        selector = _attr_selector("data-testid", fp.data_testid, fp.tag_name)
+        locator = self._get_locator(page, selector)
+        count = await self._count(selector, locator)
         if count == 1:
             return SelectorCandidate(
                 locator=locator,
                 selector=selector,
-                confidence=self._compute_live_confidence(fp, t=0.95, r=0.7, a=0.9, p=0.7, d=0.7),
+                confidence=_STRATEGY_CONF["testid+tag"],
                 strategy="testid+tag",
             )
         if count > 1:
@@ -381,14 +693,14 @@ class SelectorEngine:
             if narrowed:
                 return SelectorCandidate(
                     locator=narrowed,
-                    selector=f"{selector} + text",
-                    confidence=self._compute_live_confidence(fp, t=0.85, r=0.6, a=0.8, p=0.7, d=0.6),
+                    selector=_PLUS_TEXT_SEL % selector,
+                    confidence=_STRATEGY_CONF["testid+tag+text"],
                     strategy="testid+tag+text",
                 )
             return SelectorCandidate(
                 locator=locator.first,
-                selector=f"{selector} >> nth=0",
-                confidence=self._compute_live_confidence(fp, t=0.8, r=0.5, a=0.7, p=0.8, d=0.5),
+                selector=_NTH_SEL % (selector, 0),
+                confidence=_STRATEGY_CONF["testid+tag+first"],
                 strategy="testid+tag+first",
             )
         return None
@@ -400,24 +712,42 @@ class SelectorEngine:
     async def _strategy_test_attr(
         self, page: Page, fp: ElementFingerprint
     ) -> Optional[SelectorCandidate]:
-        """Match using common testing-library attributes stored in fp.attributes."""
-        if not fp.attributes:
+        """Match using common testing-library attributes stored in fp.attributes.
+
+        Each attribute is tried bare, then tag-qualified, in _TEST_ATTRS
+        order; all probes are counted concurrently up front.
+        """
+        attributes = fp.attributes
+        # Most elements carry none of the test attributes: one C-level
+        # set check rejects them without per-attribute lookups.
+        if not attributes or _TEST_ATTR_SET.isdisjoint(attributes):
             return None
+
+        tags = ("", fp.tag_name) if fp.tag_name else ("",)
+        probes: list[tuple[str, str, str, Locator]] = []  # (attr, tag, selector, locator)
         for attr in _TEST_ATTRS:
-            val = fp.attributes.get(attr)
+            val = attributes.get(attr)
             if not val:
                 continue
-            selector = f'[{attr}="{val}"]'
-            locator = page.locator(selector)
-            count = await locator.count()
+            for tag in tags:
+                selector = _attr_selector(attr, val, tag)
+                probes.append((attr, tag, selector, self._get_locator(page, selector)))
+        if not probes:
+            return None
+
+        counts = await self._count_all([(sel, locator) for _, _, sel, locator in probes])
+        for (attr, tag, selector, locator), count in zip(probes, counts):
+            if isinstance(count, BaseException):
+                # Surfaces only if no higher-priority probe matched
+                raise count
+            suffix = "+tag" if tag else ""
+            conf_key = "test-attr+tag" if tag else "test-attr"
             if count == 1:
                 return SelectorCandidate(
                     locator=locator,
                     selector=selector,
-                    confidence=self._compute_live_confidence(
-                        fp, t=1.0, r=0.8, a=0.9, p=0.8, d=0.7
-                    ),
-                    strategy=attr,
+                    confidence=_STRATEGY_CONF[conf_key],
+                    strategy=sys.intern(attr + suffix),
                 )
             # Multiple matches — narrow by text
             if count > 1:
@@ -425,36 +755,10 @@ class SelectorEngine:
                 if narrowed:
                     return SelectorCandidate(
                         locator=narrowed,
-                        selector=f'[{attr}="{val}"] + text',
-                        confidence=self._compute_live_confidence(
-                            fp, t=0.9, r=0.7, a=0.85, p=0.7, d=0.6
-                        ),
-                        strategy=f"{attr}+text",
-                    )
-            if fp.tag_name:
-                selector = f'{fp.tag_name}[{attr}="{val}"]'
-                locator = page.locator(selector)
-                count = await locator.count()
-                if count == 1:
-                    return SelectorCandidate(
-                        locator=locator,
-                        selector=selector,
-                        confidence=self._compute_live_confidence(
-                            fp, t=0.95, r=0.7, a=0.9, p=0.7, d=0.7
-                        ),
-                        strategy=f"{attr}+tag",
+                        selector=_PLUS_TEXT_SEL % selector,
+                        confidence=_STRATEGY_CONF[conf_key + "+text"],
+                        strategy=sys.intern(attr + suffix + "+text"),
                     )
-                if count > 1:
-                    narrowed = await self._narrow_by_text(locator, fp)
-                    if narrowed:
-                        return SelectorCandidate(
-                            locator=narrowed,
-                            selector=f'{fp.tag_name}[{attr}="{val}"] + text',
-                            confidence=self._compute_live_confidence(
-                                fp, t=0.85, r=0.6, a=0.8, p=0.7, d=0.6
-                            ),
-                            strategy=f"{attr}+tag+text",
-                        )
         return None
 
     # ------------------------------------------------------------------
@@ -468,13 +772,12 @@ class SelectorEngine:
             return None
         if _DYNAMIC_ID_RE.match(fp.element_id):
             return None
-        selector = f"#{fp.element_id}"
-        locator = page.locator(selector)
-        if await locator.count() == 1:
+        selector = _id_selector(fp.element_id)
+        if await self._quick_unique_match(page, selector):
             return SelectorCandidate(
-                locator=locator,
+                locator=self._get_locator(page, selector),
                 selector=selector,
-                confidence=self._compute_live_confidence(fp, t=0.95, r=0.7, a=0.8, p=0.7, d=0.7),
+                confidence=_STRATEGY_CONF["id"],
                 strategy="id",
             )
         return None
@@ -488,18 +791,12 @@ class SelectorEngine:
     ) -> Optional[SelectorCandidate]:
         if not fp.name:
             return None
-        if fp.tag_name:
-            selector = f'{fp.tag_name}[name="{fp.name}"]'
-        else:
-            selector = f'[name="{fp.name}"]'
-        locator = page.locator(selector)
-        if await locator.count() == 1:
+        selector = _attr_selector("name", fp.name, fp.tag_name)
+        if await self._quick_unique_match(page, selector):
             return SelectorCandidate(
-                locator=locator,
+                locator=self._get_locator(page, selector),
                 selector=selector,
-                confidence=self._compute_live_confidence(
-                    fp, t=0.85, r=0.7, a=0.85, p=0.7, d=0.6
-                ),
+                confidence=_STRATEGY_CONF["name"],
                 strategy="name",
             )
         return None
@@ -518,11 +815,11 @@ class SelectorEngine:
             page.get_by_role(fp.role, name=name) if name else page.get_by_role(fp.role)
         )
         if await locator.count() == 1:
-            selector = f'role={fp.role}[name="{name}"]' if name else f"role={fp.role}"
+            selector = _ROLE_NAME_SEL % (fp.role, _quote(name)) if name else _ROLE_SEL % fp.role
             return SelectorCandidate(
                 locator=locator,
                 selector=selector,
-                confidence=self._compute_live_confidence(fp, t=0.7, r=1.0, a=0.7, p=0.7, d=0.6),
+                confidence=_STRATEGY_CONF["role+name"],
                 strategy="role+name",
             )
         return None
@@ -538,27 +835,21 @@ class SelectorEngine:
             return None
         # Prefer tag-qualified selector for specificity
         if fp.tag_name:
-            selector = f'{fp.tag_name}[aria-label="{fp.aria_label}"]'
-            locator = page.locator(selector)
-            if await locator.count() == 1:
+            selector = _attr_selector("aria-label", fp.aria_label, fp.tag_name)
+            if await self._quick_unique_match(page, selector):
                 return SelectorCandidate(
-                    locator=locator,
+                    locator=self._get_locator(page, selector),
                     selector=selector,
-                    confidence=self._compute_live_confidence(
-                        fp, t=0.7, r=0.95, a=0.85, p=0.7, d=0.6
-                    ),
+                    confidence=_STRATEGY_CONF["aria+tag"],
                     strategy="aria+tag",
                 )
         # Fallback: aria-label only
-        selector = f'[aria-label="{fp.aria_label}"]'
-        locator = page.locator(selector)
-        if await locator.count() == 1:
+        selector = _attr_selector("aria-label", fp.aria_label)
+        if await self._quick_unique_match(page, selector):
             return SelectorCandidate(
-                locator=locator,
+                locator=self._get_locator(page, selector),
                 selector=selector,
-                confidence=self._compute_live_confidence(
-                    fp, t=0.6, r=0.9, a=0.8, p=0.5, d=0.5
-                ),
+                confidence=_STRATEGY_CONF["aria-label"],
                 strategy="aria-label",
             )
         return None
@@ -577,8 +868,8 @@ class SelectorEngine:
         if await locator.count() == 1:
             return SelectorCandidate(
                 locator=locator,
-                selector=f'text="{text}"',
-                confidence=self._compute_live_confidence(fp, t=0.5, r=0.6, a=0.7, p=0.6, d=0.5),
+                selector=_TEXT_SEL % _quote(text),
+                confidence=_STRATEGY_CONF["text-exact"],
                 strategy="text-exact",
             )
         return None
@@ -593,12 +884,12 @@ class SelectorEngine:
         if not fp.text_content or not fp.tag_name:
             return None
         text = fp.text_content[:80]
-        locator = page.locator(fp.tag_name).filter(has_text=text)
+        locator = self._get_locator(page, fp.tag_name).filter(has_text=text)
         if await locator.count() == 1:
             return SelectorCandidate(
                 locator=locator,
-                selector=f'{fp.tag_name}:has-text("{text}")',
-                confidence=self._compute_live_confidence(fp, t=0.45, r=0.5, a=0.65, p=0.6, d=0.5),
+                selector=_TAG_TEXT_SEL % (fp.tag_name, _quote(text)),
+                confidence=_STRATEGY_CONF["tag+text"],
                 strategy="tag+text",
             )
         return None
@@ -616,8 +907,8 @@ class SelectorEngine:
         if await locator.count() == 1:
             return SelectorCandidate(
                 locator=locator,
-                selector=f'placeholder="{fp.placeholder}"',
-                confidence=self._compute_live_confidence(fp, t=0.85, r=0.7, a=0.9, p=0.7, d=0.6),
+                selector=_PLACEHOLDER_SEL % _quote(fp.placeholder),
+                confidence=_STRATEGY_CONF["placeholder"],
                 strategy="placeholder",
             )
         return None
@@ -633,14 +924,14 @@ class SelectorEngine:
             return None
 
         dynamic_only = self._has_only_dynamic_classes(fp)
-        locator = page.locator(fp.css_selector)
+        locator = self._get_locator(page, fp.css_selector)
         count = await locator.count()
 
         if count == 1:
             if dynamic_only:
-                conf = self._compute_live_confidence(fp, t=0.3, r=0.3, a=0.4, p=0.5, d=0.5)
+                conf = _STRATEGY_CONF["css [dynamic]"]
             else:
-                conf = self._compute_live_confidence(fp, t=0.5, r=0.5, a=0.8, p=0.5, d=0.5)
+                conf = _STRATEGY_CONF["css"]
             return SelectorCandidate(
                 locator=locator,
                 selector=fp.css_selector,
@@ -651,22 +942,22 @@ class SelectorEngine:
             # Try text narrowing first — much more reliable than nth
             narrowed = await self._narrow_by_text(locator, fp)
             if narrowed:
-                conf = self._compute_live_confidence(fp, t=0.5, r=0.5, a=0.75, p=0.6, d=0.5)
+                conf = _STRATEGY_CONF["css+text"]
                 return SelectorCandidate(
                     locator=narrowed,
-                    selector=f"{fp.css_selector} + text",
+                    selector=_PLUS_TEXT_SEL % fp.css_selector,
                     confidence=conf,
                     strategy="css+text",
                 )
             if fp.nth_of_type >= 0:
                 locator = locator.nth(fp.nth_of_type)
                 if dynamic_only:
-                    conf = self._compute_live_confidence(fp, t=0.2, r=0.2, a=0.3, p=0.6, d=0.4)
+                    conf = _STRATEGY_CONF["css+nth [dynamic]"]
                 else:
-                    conf = self._compute_live_confidence(fp, t=0.4, r=0.4, a=0.6, p=0.8, d=0.5)
+                    conf = _STRATEGY_CONF["css+nth"]
                 return SelectorCandidate(
                     locator=locator,
-                    selector=f"{fp.css_selector} >> nth={fp.nth_of_type}",
+                    selector=_NTH_SEL % (fp.css_selector, fp.nth_of_type),
                     confidence=conf,
                     strategy="css+nth" + (" [dynamic]" if dynamic_only else ""),
                 )
@@ -681,15 +972,13 @@ class SelectorEngine:
     ) -> Optional[SelectorCandidate]:
         if not fp.xpath:
             return None
-        selector = f"xpath={fp.xpath}"
-        locator = page.locator(selector)
+        selector = _XPATH_SEL % fp.xpath
+        locator = self._get_locator(page, selector)
         if await locator.count() == 1:
             return SelectorCandidate(
                 locator=locator,
                 selector=selector,
-                confidence=self._compute_live_confidence(
-                    fp, t=0.3, r=0.3, a=0.5, p=0.7, d=0.9
-                ),
+                confidence=_STRATEGY_CONF["xpath"],
                 strategy="xpath",
             )
         return None
@@ -710,57 +999,28 @@ class SelectorEngine:
         """
         Compute confidence with overridable factor scores.
         Confidence = 0.4*T + 0.2*R + 0.15*A + 0.15*P + 0.1*D
+
+        The built-in strategies use the precomputed ``_STRATEGY_CONF``.
         """
-        score = 0.4 * t + 0.2 * r + 0.15 * a + 0.15 * p + 0.1 * d
-        return round(min(score, 1.0), 4)
+        return _weighted_confidence(t, r, a, p, d)
 
     # ------------------------------------------------------------------
-    # Static factor scores (for pre-scoring fingerprints)
+    # Strategy table
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _score_test_id(fp: ElementFingerprint) -> float:
-        if fp.data_testid:
-            return 1.0
-        if fp.element_id:
-            return 0.9
-        if fp.name:
-            return 0.6
-        return 0.0
-
-    @staticmethod
-    def _score_role(fp: ElementFingerprint) -> float:
-        if fp.role and fp.aria_label:
-            return 1.0
-        if fp.role:
-            return 0.7
-        if fp.aria_label:
-            return 0.5
-        return 0.0
-
-    @staticmethod
-    def _score_attributes(fp: ElementFingerprint) -> float:
-        score = 0.0
-        if fp.placeholder:
-            score += 0.3
-        if fp.href:
-            score += 0.2
-        if fp.class_names:
-            score += 0.2
-        if fp.attributes:
-            score += min(len(fp.attributes) * 0.05, 0.3)
-        return min(score, 1.0)
-
-    @staticmethod
-    def _score_positional(fp: ElementFingerprint) -> float:
-        if fp.parent_tag:
-            return 0.6
-        return 0.2
-
-    @staticmethod
-    def _score_dom_structure(fp: ElementFingerprint) -> float:
-        if fp.xpath:
-            return 0.8
-        if fp.css_selector:
-            return 0.5
-        return 0.1
+    # (name, unbound strategy) in tie-break order, built once with the class
+    # rather than as bound methods on every _generate_candidates call.
+    _STRATEGIES = (
+        ("data-testid", _strategy_testid),
+        ("testid+tag", _strategy_testid_tag),
+        ("data-cy", _strategy_test_attr),
+        ("id", _strategy_id),
+        ("name", _strategy_name),
+        ("role+name", _strategy_role),
+        ("aria-label", _strategy_aria),
+        ("placeholder", _strategy_placeholder),
+        ("text-exact", _strategy_text),
+        ("tag+text", _strategy_tag_text),
+        ("css", _strategy_css),
+        ("xpath", _strategy_xpath),
+    )
@@ -4,7 +4,6 @@ cache, confidence threshold, and telemetry.
 """
 
 import unittest
-from unittest.mock import AsyncMock, MagicMock
 
 from engine.healer import HealingEngine, HealingResult, HealingTelemetry
 from engine.models import ElementFingerprint, EngineConfig, HealingMode
@@ -36,13 +35,34 @@ def _fp(
     )
 
 
+class _FakeFirst:
+    """Visible, enabled, rendered element."""
+
+    async def is_visible(self, timeout: float | None = None) -> bool:
+        return True
+
+    async def is_enabled(self, timeout: float | None = None) -> bool:
+        return True
+
+    async def bounding_box(self, timeout: float | None = None) -> dict:
+        return {"x": 0, "y": 0}
+
+
+class _FakeLocator:
+    first = _FakeFirst()
+
+    async def count(self) -> int:
+        return 1
+
+
+class _FakePage:
+    def locator(self, selector: str) -> _FakeLocator:
+        return _FakeLocator()
+
+
 class TestFingerprintSimilarity(unittest.TestCase):
     """Step 4: _compute_fingerprint_similarity."""
 
-    def setUp(self) -> None:
-        self.config = EngineConfig(healing_mode=HealingMode.STRICT, llm_enabled=True)
-        self.engine = HealingEngine(self.config)
-
     def test_exact_match_high_score(self) -> None:
         fp = _fp(tag_name="button", role="button", data_testid="submit", text_content="Submit")
         score = HealingEngine._compute_fingerprint_similarity(fp, fp)
@@ -73,6 +93,19 @@ class TestFingerprintSimilarity(unittest.TestCase):
         self.assertGreaterEqual(score, 0.0)
         self.assertLessEqual(score, 1.0)
 
+    def test_batch_matches_scalar(self) -> None:
+        target = _fp(tag_name="button", role="button", text_content="Submit form", class_names=["btn"])
+        candidates = [
+            _fp(tag_name="button", role="button", text_content="Submit"),
+            _fp(tag_name="a", text_content="Cancel", class_names=["btn", "link"]),
+            _fp(),
+        ]
+        scores = HealingEngine._compute_fingerprint_similarity_batch(target, candidates)
+        self.assertEqual(
+            scores,
+            [HealingEngine._compute_fingerprint_similarity(target, c) for c in candidates],
+        )
+
 
 class TestBuildSelectorFromCandidate(unittest.TestCase):
     """Step 5: _build_selector_from_candidate."""
@@ -117,18 +150,32 @@ class TestHealingCache(unittest.IsolatedAsyncioTestCase):
     async def test_cache_check_uses_healed_selector(self) -> None:
         config = EngineConfig(healing_mode=HealingMode.STRICT, llm_enabled=True)
         engine = HealingEngine(config)
-        page = MagicMock()
-        locator = MagicMock()
-        locator.count = AsyncMock(return_value=1)
-        locator.first = MagicMock()
-        locator.first.is_visible = AsyncMock(return_value=True)
-        locator.first.is_enabled = AsyncMock(return_value=True)
-        locator.first.bounding_box = AsyncMock(return_value={"x": 0, "y": 0})
-        page.locator.return_value = locator
+        page = _FakePage()
         engine._cache["broken"] = "[data-testid=ok]"
         valid = await engine._validate_healed_selector(page, "[data-testid=ok]")
         self.assertTrue(valid)
 
+    async def test_cache_prefix_fallback(self) -> None:
+        engine = HealingEngine(EngineConfig())
+        engine._cache["div.foo"] = "[data-testid=foo]"
+        self.assertEqual(engine._cache_lookup_with_fallback("div.foo.bar"), "[data-testid=foo]")
+        self.assertEqual(engine._cache_lookup_with_fallback('div.foo[type="x"]'), "[data-testid=foo]")
+        self.assertIsNone(engine._cache_lookup_with_fallback("span.foo.bar"))
+        self.assertIsNone(engine._cache_lookup_with_fallback("div.foo > .bar"))
+
+    async def test_cache_lru_evicts_oldest(self) -> None:
+        engine = HealingEngine(EngineConfig(healing_cache_max=2))
+        engine._cache_put("a", "A")
+        engine._cache_put("b", "B")
+        self.assertEqual(engine._cache_get("a"), "A")  # "b" is now oldest
+        engine._cache_put("c", "C")
+        self.assertEqual(list(engine._cache), ["a", "c"])
+        self.assertIsNone(engine._cache_get("b"))
+
+    def test_cache_max_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            EngineConfig(healing_cache_max=0)
+
 
 class TestConfidenceThreshold(unittest.TestCase):
     """Step 2: Confidence threshold enforcement (tested via parse + logic)."""
@@ -140,6 +187,26 @@ class TestConfidenceThreshold(unittest.TestCase):
         self.assertEqual(result.confidence, 0.9)
         self.assertEqual(result.new_selector, "[data-testid=x]")
 
+    def test_parse_strips_code_fence_and_coerces_confidence(self) -> None:
+        raw = '```json\n{"selector": "#a", "confidence": "0.7", "explanation": "e"}\n```'
+        result = HealingEngine._parse_llm_response(raw)
+        self.assertTrue(result.success)
+        self.assertEqual(result.confidence, 0.7)
+        self.assertEqual(result.explanation, "e")
+
+    def test_parse_malformed_responses_fail_cleanly(self) -> None:
+        for raw in (
+            "not json",
+            "[1, 2]",
+            '{"selector": "#a", "confidence": null}',
+            '{"selector": "#a", "confidence": "high"}',
+        ):
+            with self.subTest(raw=raw):
+                with self.assertLogs("engine.healer", level="WARNING"):
+                    result = HealingEngine._parse_llm_response(raw)
+                self.assertFalse(result.success)
+                self.assertTrue(result.explanation.startswith("Failed to parse LLM response"))
+
     def test_parse_accepts_strategy(self) -> None:
         raw = '{"selector": "role=button", "strategy": "role", "reasoning": "ok", "confidence": 0.85}'
         result = HealingEngine._parse_llm_response(raw)
@@ -149,19 +216,20 @@ class TestConfidenceThreshold(unittest.TestCase):
 class TestFingerprintHash(unittest.TestCase):
     """Step 10: _fingerprint_hash for telemetry."""
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        # _fingerprint_hash does not touch engine state; share one engine.
+        cls.engine = HealingEngine(EngineConfig())
+
     def test_hash_deterministic(self) -> None:
-        config = EngineConfig()
-        engine = HealingEngine(config)
         fp = _fp(tag_name="button", role="button")
-        h1 = engine._fingerprint_hash(fp)
-        h2 = engine._fingerprint_hash(fp)
+        h1 = self.engine._fingerprint_hash(fp)
+        h2 = self.engine._fingerprint_hash(fp)
         self.assertEqual(h1, h2)
 
     def test_hash_different_for_different_fp(self) -> None:
-        config = EngineConfig()
-        engine = HealingEngine(config)
-        h1 = engine._fingerprint_hash(_fp(tag_name="button"))
-        h2 = engine._fingerprint_hash(_fp(tag_name="a"))
+        h1 = self.engine._fingerprint_hash(_fp(tag_name="button"))
+        h2 = self.engine._fingerprint_hash(_fp(tag_name="a"))
         self.assertNotEqual(h1, h2)
 
 
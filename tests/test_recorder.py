@@ -0,0 +1,94 @@
+"""
+Unit tests for RecorderEngine: assertion de-duplication and type coalescing.
+"""
+
+import unittest
+
+# Aliased so pytest does not try to collect the model as a test class.
+from engine.models import TestModel as RecordedTest
+from engine.recorder import RecorderEngine
+
+
+class TestRecorderAssertionDedup(unittest.TestCase):
+    """RecorderEngine.handle_assertion drops repeats on the same step."""
+
+    _TOAST = {"tag_name": "div", "data_testid": "toast"}
+
+    def setUp(self) -> None:
+        self.recorder = RecorderEngine(RecordedTest())
+        self.recorder._recording = True  # no browser: skip start()
+        self.recorder._on_payload({"action": "click", "fingerprint": {"tag_name": "button"}})
+
+    def _assertions(self) -> list[tuple[str, str]]:
+        return [
+            (a.assertion_type.value, a.expected_value)
+            for step in self.recorder.stop().steps
+            for a in step.assertions
+        ]
+
+    def test_repeat_on_same_step_dropped(self) -> None:
+        self.recorder.handle_assertion({"assertion_type": "visible", "fingerprint": self._TOAST})
+        self.recorder.handle_assertion({"assertion_type": "visible", "fingerprint": self._TOAST})
+        self.assertEqual(self._assertions(), [("visible", "")])
+
+    def test_different_expected_value_kept(self) -> None:
+        for value in ("Saved", "Saved", "Deleted"):
+            self.recorder.handle_assertion(
+                {"assertion_type": "text_equals", "value": value, "fingerprint": self._TOAST}
+            )
+        self.assertEqual(self._assertions(), [("text_equals", "Saved"), ("text_equals", "Deleted")])
+
+    def test_element_without_identity_never_deduplicated(self) -> None:
+        for _ in range(2):
+            self.recorder.handle_assertion({"assertion_type": "visible", "fingerprint": {"tag_name": "div"}})
+        self.assertEqual(self._assertions(), [("visible", ""), ("visible", "")])
+
+    def test_new_step_resets_seen_assertions(self) -> None:
+        self.recorder.handle_assertion({"assertion_type": "visible", "fingerprint": self._TOAST})
+        self.recorder._on_payload({"action": "click", "fingerprint": {"tag_name": "a"}})
+        self.recorder.handle_assertion({"assertion_type": "visible", "fingerprint": self._TOAST})
+        steps = self.recorder.stop().steps
+        self.assertEqual([len(step.assertions) for step in steps], [1, 1])
+
+
+class TestRecorderTypeCoalescing(unittest.TestCase):
+    """Keystrokes on the same field extend the last TYPE step."""
+
+    def setUp(self) -> None:
+        self.recorder = RecorderEngine(RecordedTest())
+        self.recorder._recording = True  # no browser: skip start()
+
+    def _type(self, value: str, fingerprint: dict | None = None) -> None:
+        if fingerprint is None:
+            # Fresh per event, like payloads from the page
+            fingerprint = {
+                "tag_name": "input",
+                "name": "email",
+                "selectors": {"preferred": '[name="email"]'},
+            }
+        self.recorder._on_payload({"action": "type", "value": value, "fingerprint": fingerprint})
+
+    def _values(self) -> list[str]:
+        return [step.action.value for step in self.recorder.stop().steps]
+
+    def test_extending_value_coalesced(self) -> None:
+        for value in ("a", "ab", "abc"):
+            self._type(value)
+        self.assertEqual(self._values(), ["abc"])
+
+    def test_other_field_starts_new_step(self) -> None:
+        self._type("a")
+        self._type("ab", {"tag_name": "input", "name": "password"})
+        self.assertEqual(self._values(), ["a", "ab"])
+
+    def test_rewritten_target_still_coalesced(self) -> None:
+        self._type("a")
+        # As the executor does when a healed selector is written back
+        target = self.recorder._pending[-1].target
+        target.css_selector = target.selectors["preferred"] = "#healed"
+        self._type("ab")
+        self.assertEqual(self._values(), ["ab"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+"""
+Unit tests for SelectorEngine: selector quoting, batched attribute
+probes, the precomputed fast path, and the resolve → resolve_candidates
+scan handoff.
+"""
+
+import unittest
+from unittest import mock
+
+from engine.models import ElementFingerprint, EngineConfig
+from engine.selector import (
+    _HANDOFF_MAX_AGE_S,
+    _TEST_ATTRS,
+    SelectorCandidate,
+    SelectorEngine,
+    _attr_selector,
+    _id_selector,
+    _quote,
+)
+
+
+def _candidate(selector: str, confidence: float) -> SelectorCandidate:
+    return SelectorCandidate(locator=None, selector=selector, confidence=confidence, strategy="css")
+
+
+class _FakeLocator:
+    def __init__(self, count: int = 0, text: str = "") -> None:
+        self._count = count
+        self._text = text
+
+    @property
+    def first(self) -> "_FakeLocator":
+        return self
+
+    async def count(self) -> int:
+        return self._count
+
+    async def text_content(self, timeout: float | None = None) -> str:
+        return self._text
+
+    def get_by_text(self, text: str, exact: bool = False) -> "_FakeLocator":
+        return _FakeLocator()
+
+
+class _FakePage:
+    """Records every ``locator()`` selector; ``counts`` maps selector →
+    match count (0 if absent) and every match has text ``text``."""
+
+    def __init__(self, counts: dict[str, int] | None = None, text: str = "") -> None:
+        self.counts = counts or {}
+        self.text = text
+        self.requested: list[str] = []
+
+    def locator(self, selector: str) -> _FakeLocator:
+        self.requested.append(selector)
+        return _FakeLocator(self.counts.get(selector, 0), self.text)
+
+    def get_by_role(self, role: str, name: str | None = None) -> _FakeLocator:
+        return _FakeLocator()
+
+    def get_by_placeholder(self, text: str) -> _FakeLocator:
+        return _FakeLocator()
+
+    def get_by_text(self, text: str, exact: bool = False) -> _FakeLocator:
+        return _FakeLocator()
+
+    async def evaluate(self, script: str, selectors: list[str]) -> list[int]:
+        return [self.counts.get(sel, 0) for sel in selectors]
+
+    def once(self, event: str, callback) -> None:
+        pass
+
+
+class TestSelectorQuoting(unittest.TestCase):
+    """Recorded values are escaped when interpolated into selectors."""
+
+    def test_quote_escapes_quotes_and_backslashes(self) -> None:
+        self.assertEqual(_quote('q"t'), '"q\\"t"')
+        self.assertEqual(_quote("a\\b"), '"a\\\\b"')
+
+    def test_quote_escapes_line_breaks(self) -> None:
+        self.assertEqual(_quote("Close\ndialog"), '"Close\\a dialog"')
+        self.assertEqual(_quote("a\r\nb"), '"a\\d \\a b"')
+
+    def test_attr_selector(self) -> None:
+        self.assertEqual(_attr_selector("data-testid", 'q"t'), '[data-testid="q\\"t"]')
+        self.assertEqual(_attr_selector("name", "a\\b", "input"), 'input[name="a\\\\b"]')
+
+    def test_id_selector_uses_hash_only_for_identifiers(self) -> None:
+        self.assertEqual(_id_selector("main"), "#main")
+        self.assertEqual(_id_selector("login-btn_2"), "#login-btn_2")
+        self.assertEqual(_id_selector("1abc"), '[id="1abc"]')
+        self.assertEqual(_id_selector("a:b"), '[id="a:b"]')
+        self.assertEqual(_id_selector("a b"), '[id="a b"]')
+
+
+class TestAttrProbeSelectors(unittest.IsolatedAsyncioTestCase):
+    """_attr_probe_selectors batches exactly what the attribute strategies look up."""
+
+    async def test_probes_match_strategy_lookups(self) -> None:
+        engine = SelectorEngine(EngineConfig())
+        for tag_name in ("button", ""):
+            fp = ElementFingerprint(
+                tag_name=tag_name,
+                element_id="login",
+                data_testid="submit",
+                name="q",
+                aria_label="Close",
+                attributes={attr: "v" for attr in _TEST_ATTRS},
+            )
+            page = _FakePage()
+            for strategy in (
+                engine._strategy_testid,
+                engine._strategy_testid_tag,
+                engine._strategy_test_attr,
+                engine._strategy_id,
+                engine._strategy_name,
+                engine._strategy_aria,
+            ):
+                await strategy(page, fp)
+            with self.subTest(tag_name=tag_name):
+                self.assertEqual(
+                    set(page.requested), set(SelectorEngine._attr_probe_selectors(fp))
+                )
+
+
+class TestPrecomputedFastPath(unittest.IsolatedAsyncioTestCase):
+    """A recorded selector that meets the threshold skips the other strategies."""
+
+    def _engine(self, **config) -> SelectorEngine:
+        engine = SelectorEngine(EngineConfig(**config))
+        self.ran: list[str] = []
+
+        def spy(name, strategy_fn):
+            async def run(self_, page, fp):
+                self.ran.append(name)
+                return await strategy_fn(self_, page, fp)
+            return run
+
+        engine._STRATEGIES = tuple(
+            (name, spy(name, fn)) for name, fn in SelectorEngine._STRATEGIES
+        )
+        return engine
+
+    def setUp(self) -> None:
+        self.fp = ElementFingerprint(
+            tag_name="button",
+            data_testid="submit",
+            text_content="Submit",
+            selectors={"preferred": "#pre"},
+        )
+        self.counts = {"#pre": 1, '[data-testid="submit"]': 1}
+
+    async def test_match_above_threshold_returned_alone(self) -> None:
+        engine = self._engine()
+        best = await engine.resolve(_FakePage(self.counts, text="Submit"), self.fp)
+        self.assertEqual(best.strategy, "precomputed-preferred")
+        self.assertEqual(self.ran, [])
+
+    async def test_text_mismatch_falls_through_to_full_scan(self) -> None:
+        engine = self._engine()
+        candidates = await engine._generate_candidates(
+            _FakePage(self.counts, text="Cancel"), self.fp, fast_path=True
+        )
+        self.assertEqual(self.ran, [name for name, _ in SelectorEngine._STRATEGIES])
+        self.assertEqual(
+            [c.strategy for c in candidates], ["precomputed-preferred", "data-testid"]
+        )
+
+    async def test_disabled_runs_all_strategies(self) -> None:
+        engine = self._engine(fast_path_precomputed=False)
+        await engine.resolve(_FakePage(self.counts, text="Submit"), self.fp)
+        self.assertEqual(self.ran, [name for name, _ in SelectorEngine._STRATEGIES])
+
+
+class TestResolveHandoff(unittest.IsolatedAsyncioTestCase):
+    """resolve() hands its scan to an immediate resolve_candidates()."""
+
+    def setUp(self) -> None:
+        self.engine = SelectorEngine(EngineConfig())
+        self.page = object()
+        self.fp = ElementFingerprint(css_selector="#a")
+        self.candidates = [_candidate("#a", 0.6), _candidate("#b", 0.9)]
+        self.scans = 0
+
+        async def scan(page, fingerprint, fast_path):
+            self.scans += 1
+            return list(self.candidates)
+
+        self.engine._scan = scan
+
+    async def test_immediate_resolve_candidates_reuses_scan(self) -> None:
+        best = await self.engine.resolve(self.page, self.fp)
+        ranked = await self.engine.resolve_candidates(self.page, self.fp)
+        self.assertEqual(self.scans, 1)
+        self.assertEqual(best.selector, "#b")
+        self.assertEqual([c.selector for c in ranked], ["#b", "#a"])
+
+    async def test_handoff_cleared_after_read(self) -> None:
+        await self.engine.resolve(self.page, self.fp)
+        await self.engine.resolve_candidates(self.page, self.fp)
+        self.assertIsNone(self.engine._handoff)
+        await self.engine.resolve_candidates(self.page, self.fp)
+        self.assertEqual(self.scans, 2)
+
+    async def test_other_page_rescans(self) -> None:
+        await self.engine.resolve(self.page, self.fp)
+        await self.engine.resolve_candidates(object(), self.fp)
+        self.assertEqual(self.scans, 2)
+
+    async def test_other_fingerprint_rescans(self) -> None:
+        await self.engine.resolve(self.page, self.fp)
+        await self.engine.resolve_candidates(self.page, ElementFingerprint(css_selector="#a"))
+        self.assertEqual(self.scans, 2)
+
+    async def test_changed_css_selector_rescans(self) -> None:
+        await self.engine.resolve(self.page, self.fp)
+        self.fp.css_selector = "#healed"
+        await self.engine.resolve_candidates(self.page, self.fp)
+        self.assertEqual(self.scans, 2)
+
+    async def test_stale_handoff_rescans(self) -> None:
+        with mock.patch(
+            "engine.selector.time.monotonic",
+            side_effect=[100.0, 100.0 + _HANDOFF_MAX_AGE_S + 0.01],
+        ):
+            await self.engine.resolve(self.page, self.fp)
+            await self.engine.resolve_candidates(self.page, self.fp)
+        self.assertEqual(self.scans, 2)
+
+    async def test_fast_path_result_not_handed_off(self) -> None:
+        self.candidates = [_candidate("#a", 0.95)]
+        await self.engine.resolve(self.page, self.fp)
+        self.assertIsNone(self.engine._handoff)
+        await self.engine.resolve_candidates(self.page, self.fp)
+        self.assertEqual(self.scans, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()